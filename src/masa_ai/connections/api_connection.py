@@ -6,7 +6,9 @@ the interface for making API requests and handling responses. It includes
 error handling and logging functionality using the QCManager.
 """
 
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from abc import ABC, abstractmethod
 from masa_ai.configs.config import global_settings
 from masa_ai.tools.qc.qc_manager import QCManager
@@ -39,6 +41,44 @@ class APIConnection(ABC):
         if not base_url:
             raise ConfigurationException("Neither BASE_URL nor BASE_URL_LOCAL is set in the configuration")
         self.base_url = base_url.rstrip('/')
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """
+        Get the HTTP session of the calling thread, creating it on first use.
+
+        requests.Session is not safe to share between threads, so each request
+        worker keeps its own pooled session.
+
+        Returns:
+            requests.Session: The calling thread's session.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._create_session()
+        return session
+
+    def _create_session(self):
+        """
+        Create a pooled HTTP session that keeps connections alive across requests.
+
+        Retries are disabled at the transport level since they are handled by
+        the RetryPolicy.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=global_settings.get('connections.POOL_CONNECTIONS', 10),
+            pool_maxsize=global_settings.get('connections.POOL_MAXSIZE', 20),
+            max_retries=0
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        return session
 
     @abstractmethod
     def get_headers(self):
@@ -92,7 +132,7 @@ class APIConnection(ABC):
         """
         headers = self.get_headers()
         try:
-            response = requests.request(
+            response = self.session.request(
                 method,
                 url,
                 json=data,
@@ -6,10 +6,12 @@ specifically for interacting with the XTwitter API. It handles authentication,
 request formatting, and response processing for XTwitter-specific endpoints.
 """
 
+import threading
 from masa_ai.connections.api_connection import APIConnection
 from masa_ai.configs.config import global_settings
 from masa_ai.tools.qc.qc_manager import QCManager
 from masa_ai.tools.utils.helper_functions import format_url
+from masa_ai.tools.utils.rate_limiter import TokenBucket
 from masa_ai.tools.qc.exceptions import (
     AuthenticationException,
     APIException,
@@ -33,8 +35,38 @@ class XTwitterConnection(APIConnection):
         super().__init__()
         self.qc_manager.log_debug("Initializing XTwitterConnection", context="XTwitterConnection")
         self.base_url = global_settings.get('twitter.BASE_URL') or global_settings.get('twitter.BASE_URL_LOCAL')
+        self.rate_limiters = {}
+        self._rate_limiters_lock = threading.Lock()
         self.qc_manager.log_debug(f"XTwitterConnection initialized with base URL: {self.base_url}", context="XTwitterConnection")
 
+    def get_rate_limiter(self, api_endpoint):
+        """
+        Get the rate limiter for an API endpoint, creating it on first use.
+
+        Creation is serialized so that concurrent workers share one bucket per
+        endpoint and the configured rate holds across all of them.
+
+        Args:
+            api_endpoint (str): The API endpoint to rate limit.
+
+        Returns:
+            masa_ai.tools.utils.rate_limiter.TokenBucket: The endpoint's token bucket,
+            or None if rate limiting is not configured.
+        """
+        try:
+            return self.rate_limiters[api_endpoint]
+        except KeyError:
+            pass
+        with self._rate_limiters_lock:
+            if api_endpoint not in self.rate_limiters:
+                capacity = global_settings.get('twitter.RATE_LIMIT_CAPACITY')
+                refill_per_sec = global_settings.get('twitter.RATE_LIMIT_REFILL_PER_SEC')
+                if capacity and refill_per_sec:
+                    self.rate_limiters[api_endpoint] = TokenBucket(capacity, refill_per_sec)
+                else:
+                    self.rate_limiters[api_endpoint] = None
+            return self.rate_limiters[api_endpoint]
+
     def get_headers(self):
         """
         Get headers for XTwitter API requests.
@@ -61,9 +93,16 @@ class XTwitterConnection(APIConnection):
             APIException: If there's an error in making the request or processing the response.
         """
         self.qc_manager.log_debug(
-            f"Making API request with query: {date_range_query}, count: {count}",
+            "Making API request with query: %s, count: %s",
+            date_range_query,
+            count,
             context="XTwitterConnection"
         )
+        rate_limiter = self.get_rate_limiter(api_endpoint)
+        if rate_limiter:
+            waited = rate_limiter.acquire()
+            if waited:
+                self.qc_manager.log_debug("Rate limiter held request for %.2f seconds", waited, context="XTwitterConnection")
         url = format_url(self.base_url, api_endpoint)
         data = {'query': date_range_query, 'count': count}
         response = self._make_request('POST', url, data=data)
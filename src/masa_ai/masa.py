@@ -21,7 +21,6 @@ import sys
 import subprocess
 from typing import Optional, Union, List
 from pathlib import Path
-import json
 
 class Masa:
     def __init__(self):
@@ -59,9 +58,9 @@ class Masa:
 
         elif isinstance(requests, (str, Path)):
             # If the input is a string or Path, assume it's a path to a JSON file
+            from .tools.utils import json_codec
             self.qc_manager.log_debug(f"Processing requests from file: {requests}", context="Masa")
-            with open(requests, 'r') as file:
-                requests = json.load(file)
+            requests = json_codec.load_file(requests)
         elif isinstance(requests, dict):
             # If the input is a single request, wrap it in a list
             requests = [requests]
@@ -4,141 +4,414 @@ Queue module for the MASA project.
 This module provides a priority queue implementation for managing requests
 in the MASA system, ensuring efficient processing based on request priorities.
 
-The Queue class uses Python's built-in PriorityQueue to manage requests with priorities.
-Lower priority values indicate higher priority.
+The Queue class keeps requests in a binary heap ordered by priority, with ties
+served in insertion order. Lower priority values indicate higher priority.
+
+Changes to the queue are recorded as small operation records and appended to
+an operation log next to the queue file by a background flusher, so several
+changes within a short window, up to FLUSH_BATCH_SIZE, share one write and
+fsync. The log is folded into a full snapshot of the queue once it grows past
+MAX_WAL_SIZE bytes or MAX_WAL_ENTRIES records.
+
+On start the snapshot and its log are loaded to restore the order and
+priorities of the queue, then reconciled with the state manager, whose
+queued and in-progress requests decide what the queue holds.
 
 Attributes:
-    memory_queue (queue.PriorityQueue): The in-memory priority queue.
     qc_manager (tools.qc.qc_manager.QCManager): Quality control manager for logging.
     state_manager (orchestration.state_manager.StateManager): Manager for handling request states.
 """
 
+import os
 import json
+import heapq
+import hashlib
+import collections
+import itertools
+import threading
 from pathlib import Path
-from queue import PriorityQueue
 from datetime import datetime
+from typing import Optional
 from masa_ai.tools.qc.qc_manager import QCManager
-from masa_ai.tools.utils.paths import ensure_dir
+from masa_ai.tools.utils.paths import ensure_dir, atomic_write
+from masa_ai.tools.utils import json_codec
+from masa_ai.tools.utils.background_flusher import BackgroundFlusher, register_exit_flush
+from masa_ai.tools.utils.append_log import AppendLog
+
+_REMOVED = object()
 
 class Queue:
     """
     A priority queue implementation for managing requests.
 
-    This class uses Python's built-in PriorityQueue to manage requests with priorities.
-    Lower priority values indicate higher priority.
+    This class keeps requests as [priority, sequence, request_id] entries.
+    Lower priority values indicate higher priority; the sequence number serves
+    requests of equal priority in the order they were added. Requests with the
+    default priority, the common case, go to a FIFO deque; all others go to a
+    heap, and get() serves whichever head has the lower priority. Entries that
+    are removed or superseded stay in place marked as removed and are skipped
+    when they reach the front.
+
+    The dispatcher changes the queue while the background flusher snapshots
+    it, so the entries and the pending operation records are only touched
+    with ``_lock`` held.
 
     Attributes:
-        memory_queue (queue.PriorityQueue): The in-memory priority queue.
+        _heap (list): The in-memory heap of non-default-priority entries.
+        _default (collections.deque): The in-memory FIFO of default-priority entries.
+        _entry_finder (dict): The live heap entry of each queued request ID.
+        _wal_file (Path): Append-only log of queue operations since the last snapshot.
         qc_manager (masa.tools.qc.qc_manager.QCManager): Quality control manager for logging.
         state_manager (masa.orchestration.state_manager.StateManager): Manager for handling request states.
     """
 
-    def __init__(self, state_manager, queue_file: Path):
+    DEFAULT_PRIORITY = 100
+    FLUSH_BATCH_SIZE = 50
+    MAX_WAL_SIZE = 1024 * 1024
+    MAX_WAL_ENTRIES = 1000
+
+    def __init__(self, state_manager, queue_file: Path, flush_interval: Optional[float] = 0.02):
         """
         Initialize the Queue.
 
         :param state_manager: StateManager instance for managing request states.
         :param queue_file: File path to store the queue data.
         :type queue_file: Path
+        :param flush_interval: Seconds the background flusher waits after a change
+            so that later changes share the same write. If None, the queue is only
+            written on flush() or at exit.
+        :type flush_interval: float, optional
         """
         self._queue_file = queue_file
-        self.memory_queue = PriorityQueue()
+        self._heap = []
+        self._default = collections.deque()
+        self._entry_finder = {}
+        self._counter = itertools.count()
         self.state_manager = state_manager
         self.qc_manager = QCManager()
         self._queue_file.parent.mkdir(parents=True, exist_ok=True)
         
         ensure_dir(self._queue_file.parent)
+
+        self._wal_file = self._queue_file.with_name(self._queue_file.name + '.wal')
+        self._wal = AppendLog(self._wal_file)
+        self._wal_entries = 0
+        self._snapshot_stale = True
+        self._pending_ops = []
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._flusher = BackgroundFlusher(self, flush_interval, "QueueFlusher") if flush_interval else None
+        register_exit_flush(self)
         
-        self._load_queue_from_state()
+        with self._lock:
+            self._load_queue_file()
+            self._load_queue_from_state()
 
     def _load_queue_from_state(self):
         """
-        Load queued and in-progress requests from the state manager into the queue.
+        Reconcile the queue with the queued and in-progress requests of the state manager.
+
+        Entries loaded from the queue file keep their order and priority; entries
+        for requests that are no longer active are dropped, and active requests
+        missing from the file are added with the priority of their request details.
         """
         active_requests = self.state_manager.get_active_requests()
-        for request_id, request_state in active_requests.items():
-            request_details = request_state.get('request_details', {})
-            priority = request_details.get('priority', 100)
-            self.memory_queue.put((priority, request_id))
-        self.qc_manager.log_info(f"Loaded {self.memory_queue.qsize()} requests from state manager", context="Queue")
+        for request_id in [request_id for request_id in self._entry_finder if request_id not in active_requests]:
+            self._discard(request_id)
+        self._extend(
+            (request_state.get('request_details', {}).get('priority', self.DEFAULT_PRIORITY), request_id)
+            for request_id, request_state in active_requests.items()
+        )
+        self.qc_manager.log_info(f"Loaded {len(self)} requests from state manager", context="Queue")
 
     def _load_queue_file(self):
         """
         Load the queue data from the queue file, avoiding duplicates.
+
+        Operations in the operation log are replayed on top of the snapshot. The
+        next flush writes a fresh snapshot, so the file matches the queue once it
+        has been reconciled with the state manager.
         """
         if self._queue_file.exists():
             try:
-                with self._queue_file.open('r') as file:
-                    queue_data = json.load(file)
-                for priority, request_id in queue_data:
-                    if not any(item[1] == request_id for item in self.memory_queue.queue):
-                        self.memory_queue.put((priority, request_id))
+                queue_data = json_codec.load_file(self._queue_file)
+                self._extend(queue_data)
                 self.qc_manager.log_debug("Queue file loaded successfully", context="Queue")
-            except json.JSONDecodeError:
-                self.qc_manager.log_warning("Invalid JSON in queue file. Creating new queue.", context="Queue")
-                self._save_queue()
+                self._wal_entries = self._replay_wal()
+            except json_codec.JSONDecodeError:
+                corrupt_file = self._queue_file.with_name(self._queue_file.name + '.corrupt')
+                os.replace(self._queue_file, corrupt_file)
+                self.qc_manager.log_warning(f"Invalid JSON in queue file, moved to {corrupt_file}. Creating new queue.", context="Queue")
         else:
             self.qc_manager.log_info("Queue file not found. Creating new queue.", context="Queue")
-            self._save_queue()
         
-        self.qc_manager.log_info(f"Total requests in queue after loading: {self.memory_queue.qsize()}", context="Queue")
+        self.qc_manager.log_info(f"Total requests in queue after loading: {len(self)}", context="Queue")
+
+    def __len__(self):
+        """Return the number of requests in the queue."""
+        return len(self._entry_finder)
+
+    def __contains__(self, request_id):
+        """Return whether a request is queued, without scanning the queue."""
+        return request_id in self._entry_finder
+
+    def _push(self, priority, request_id):
+        """Push a request onto the queue, superseding any entry it already has. Must be called with the lock held."""
+        self._discard(request_id)
+        entry = [priority, next(self._counter), request_id]
+        self._entry_finder[request_id] = entry
+        if priority == self.DEFAULT_PRIORITY:
+            self._default.append(entry)
+        else:
+            heapq.heappush(self._heap, entry)
+
+    def _extend(self, queue_data):
+        """
+        Add (priority, request_id) pairs in bulk, skipping requests already queued.
+
+        The heap is rebuilt once with heapify instead of one push per request.
+        Must be called with the lock held.
+
+        Args:
+            queue_data (iterable): The (priority, request_id) pairs, in serving order within each priority.
+        """
+        for priority, request_id in queue_data:
+            if request_id not in self._entry_finder:
+                entry = [priority, next(self._counter), request_id]
+                self._entry_finder[request_id] = entry
+                if priority == self.DEFAULT_PRIORITY:
+                    self._default.append(entry)
+                else:
+                    self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def _discard(self, request_id):
+        """
+        Mark the queue entry of a request as removed. Must be called with the lock held.
+
+        Returns:
+            bool: True if the request was queued, False otherwise.
+        """
+        entry = self._entry_finder.pop(request_id, None)
+        if entry is None:
+            return False
+        entry[2] = _REMOVED
+        return True
+
+    def _head(self):
+        """
+        Find the structure whose front entry is served next. Must be called with the lock held.
+
+        Removed entries are dropped from the front of both structures first.
+
+        Returns:
+            list or collections.deque: The heap or the deque, or None if the queue is empty.
+        """
+        while self._heap and self._heap[0][2] is _REMOVED:
+            heapq.heappop(self._heap)
+        while self._default and self._default[0][2] is _REMOVED:
+            self._default.popleft()
+        if self._heap and (not self._default or self._heap[0] < self._default[0]):
+            return self._heap
+        return self._default or None
+
+    def _replay_wal(self):
+        """
+        Apply the operation log to the queue.
+
+        Replaying is idempotent: the last operation on a request decides whether
+        it is queued, so records already contained in the snapshot are harmless.
+        Replay stops at the first incomplete record, e.g. one cut short by a crash.
+
+        Returns:
+            int: The number of records replayed.
+        """
+        if not self._wal_file.exists():
+            return 0
+        replayed = 0
+        with self._wal_file.open('rb') as file:
+            for line in file:
+                try:
+                    record = json_codec.loads(line)
+                except json_codec.JSONDecodeError:
+                    self.qc_manager.log_warning("Truncated record in queue operation log. Ignoring the rest.", context="Queue")
+                    break
+                if record['op'] == 'add':
+                    self._push(record['priority'], record['id'])
+                elif record['op'] == 'pop':
+                    self._discard(record['id'])
+                elif record['op'] == 'clear':
+                    self._heap.clear()
+                    self._default.clear()
+                    self._entry_finder.clear()
+                replayed += 1
+        self.qc_manager.log_debug("Replayed %d queue operation log records", replayed, context="Queue")
+        return replayed
+
+    def _mark_dirty(self, *ops):
+        """
+        Record queue operations and wake the background flusher.
+
+        Args:
+            *ops (dict): The operation records, e.g. {'op': 'pop', 'id': request_id}.
+        """
+        with self._lock:
+            self._pending_ops.extend(ops)
+            self._dirty = True
+            batch_full = len(self._pending_ops) >= self.FLUSH_BATCH_SIZE
+        if self._flusher:
+            self._flusher.notify(batch_full=batch_full)
+
+    def flush(self):
+        """
+        Write the queue operations recorded since the last flush.
+
+        Operations are appended to the operation log, which is folded into a
+        full snapshot when this queue has not written a snapshot yet or the log
+        has grown past its limits.
+        """
+        with self._save_lock:
+            with self._lock:
+                ops, self._pending_ops = self._pending_ops, []
+                self._dirty = False
+            if not ops:
+                return
+            if (self._snapshot_stale
+                    or not self._queue_file.exists()
+                    or self._wal_entries >= self.MAX_WAL_ENTRIES
+                    or (self._wal_file.exists() and self._wal_file.stat().st_size >= self.MAX_WAL_SIZE)):
+                self._save_queue()
+                return
+            records = b''.join(json_codec.dumps(op) + b'\n' for op in ops)
+            self._wal.append(records)
+            self._wal_entries += len(ops)
+            self.qc_manager.log_debug("Appended queue operations to operation log", context="Queue")
+
+    def close(self):
+        """Stop the background flusher and write any unsaved changes."""
+        if self._flusher:
+            self._flusher.stop()
+        self.flush()
+        self._wal.close()
 
     def _save_queue(self):
         """
         Save the current queue data to the queue file.
+
+        The file is replaced atomically, so a crash mid-write never leaves a
+        truncated queue file behind. The operation log is emptied afterwards.
+        The file is compact, or indented for readability when debug logging is
+        enabled.
         """
         self.qc_manager.log_debug("Saving queue to file", context="Queue")
-        queue_data = list(self.memory_queue.queue)
-        with self._queue_file.open('w') as file:
-            json.dump(queue_data, file, indent=4)
+        # Snapshot both structures together under the lock. Sorting keeps requests
+        # of equal priority in order when the file is loaded.
+        with self._lock:
+            entries = itertools.chain(sorted(self._heap), self._default)
+            queue_data = [(priority, request_id) for priority, _, request_id in entries if request_id is not _REMOVED]
+        atomic_write(self._queue_file, json_codec.dumps(queue_data, indent=self.qc_manager.is_debug()), drop_cache=True)
+        self._wal.remove()
+        self._wal_entries = 0
+        self._snapshot_stale = False
         self.qc_manager.log_debug("Queue saved successfully", context="Queue")
 
     def add(self, request):
         """
-        Add a request to the queue if it's not already completed or cancelled.
+        Add a request to the queue if it's not already queued.
+
+        A request that is already queued with a different priority is moved to
+        its new priority.
 
         Args:
             request (dict): The request to add to the queue.
         """
-        request_id = request['id']
-        if not any(item[1] == request_id for item in self.memory_queue.queue):
-            priority = request.get('priority', 100)
-            self.memory_queue.put((priority, request_id))
-            self.state_manager.update_request_state(request_id, 'queued', request_details=request)
-            self.qc_manager.log_debug(f"Added request {request_id} with priority {priority}", context="Queue")
-        else:
-            self.qc_manager.log_debug(f"Skipping duplicate request {request_id}", context="Queue")
+        self.add_many([request])
+
+    def add_many(self, requests):
+        """
+        Add several requests to the queue, skipping those already queued.
+
+        The operation records of the batch are handed to the flusher together,
+        so a bulk add wakes it once rather than once per request, and the added
+        requests are marked queued in the state manager in one update.
+
+        Args:
+            requests (list): The requests to add to the queue.
+        """
+        ops = []
+        queued = {}
+        with self._lock:
+            for request in requests:
+                request_id = request['id']
+                priority = request.get('priority', self.DEFAULT_PRIORITY)
+                entry = self._entry_finder.get(request_id)
+                if entry is None or entry[0] != priority:
+                    self._push(priority, request_id)
+                    ops.append({'op': 'add', 'id': request_id, 'priority': priority})
+                    queued[request_id] = request
+                    self.qc_manager.log_debug("Added request %s with priority %s", request_id, priority, context="Queue")
+                else:
+                    self.qc_manager.log_debug("Skipping duplicate request %s", request_id, context="Queue")
+        if ops:
+            self.state_manager.update_requests_state(queued, 'queued')
+            self._mark_dirty(*ops)
 
     def get(self):
         """
         Get the next request from the queue.
 
+        Serving a request is not written to the operation log. Until the next
+        snapshot the queue file still lists it, which is harmless: on load the
+        file is reconciled with the state manager, which keeps the request only
+        while it is queued or in progress, as resuming it requires.
+
         Returns:
             tuple: A tuple containing (request_id, request_details) or (None, None) if the queue is empty.
         """
-        if self.memory_queue.empty():
-            return None, None
-        priority, request_id = self.memory_queue.get()
+        with self._lock:
+            head = self._head()
+            if head is None:
+                return None, None
+            priority, _, request_id = heapq.heappop(head) if head is self._heap else head.popleft()
+            del self._entry_finder[request_id]
         request_state = self.state_manager.get_request_state(request_id)
 
         if request_id is None or not request_state:
             self.qc_manager.log_warning("Skipping request with missing ID or data", context="Queue")
             return None, None
 
-        self.qc_manager.log_debug(f"Retrieved request {request_id} from queue. Current status: {request_state.get('status', 'unknown')}", context="Queue")
-        self._save_queue()
+        self.qc_manager.log_debug("Retrieved request %s from queue. Current status: %s", request_id, request_state.get('status', 'unknown'), context="Queue")
         return request_id, request_state.get('request_details')
 
+    def remove(self, request_id):
+        """
+        Remove a request from the queue without processing it.
+
+        Args:
+            request_id (str): The ID of the request to remove.
+        """
+        with self._lock:
+            removed = self._discard(request_id)
+        if removed:
+            self._mark_dirty({'op': 'pop', 'id': request_id})
+            self.qc_manager.log_debug("Removed request %s from queue", request_id, context="Queue")
+
     def complete(self, request_id):
         """
         Mark a request as completed and remove it from the queue.
 
+        A request is normally completed after get() has served it. One that is
+        still queued is marked as removed rather than searched for, so get()
+        skips it when it reaches the front.
+
         Args:
             request_id (str): The ID of the request to mark as completed.
         """
-        self.qc_manager.log_debug(f"Marking request {request_id} as completed", context="Queue")
+        self.qc_manager.log_debug("Marking request %s as completed", request_id, context="Queue")
+        self.remove(request_id)
         self.state_manager.update_request_state(request_id, 'completed')
-        self.qc_manager.log_debug(f"Request {request_id} marked as completed", context="Queue")
+        self.qc_manager.log_debug("Request %s marked as completed", request_id, context="Queue")
 
     def fail(self, request_id, error):
         """
@@ -148,9 +421,9 @@ class Queue:
             request_id (str): The ID of the request to mark as failed.
             error (str): The error message.
         """
-        self.qc_manager.log_debug(f"Marking request {request_id} as failed", context="Queue")
+        self.qc_manager.log_debug("Marking request %s as failed", request_id, context="Queue")
         self.state_manager.update_request_state(request_id, 'failed', error=str(error))
-        self.qc_manager.log_debug(f"Request {request_id} marked as failed", context="Queue")
+        self.qc_manager.log_debug("Request %s marked as failed", request_id, context="Queue")
 
     def get_status(self, request_id):
         """
@@ -177,9 +450,11 @@ class Queue:
         """
         Clear the queue and save the empty state.
         """
-        while not self.memory_queue.empty():
-            self.memory_queue.get()
-        self._save_queue()
+        with self._lock:
+            self._heap.clear()
+            self._default.clear()
+            self._entry_finder.clear()
+        self._mark_dirty({'op': 'clear'})
         self.qc_manager.log_debug("Queue cleared", context="Queue")
 
     def peek(self):
@@ -189,9 +464,11 @@ class Queue:
         Returns:
             dict: The next request or None if the queue is empty.
         """
-        if self.memory_queue.empty():
-            return None
-        _, request_id = self.memory_queue.queue[0]
+        with self._lock:
+            head = self._head()
+            if head is None:
+                return None
+            _, _, request_id = head[0]
         request_state = self.state_manager.get_request_state(request_id)
         return request_state.get('request_details')
 
@@ -205,8 +482,6 @@ class Queue:
         Returns:
             str: The generated request ID.
         """
-        import hashlib
-        import json
         request_json = json.dumps(request, sort_keys=True).encode('utf-8')
         return hashlib.sha256(request_json).hexdigest()
 
@@ -218,7 +493,9 @@ class Queue:
             list: A list of dictionaries containing request details.
         """
         summary = []
-        for priority, request_id in sorted(self.memory_queue.queue):
+        with self._lock:
+            entries = sorted(self._entry_finder.values())
+        for priority, _, request_id in entries:
             request_state = self.state_manager.get_request_state(request_id)
             request_details = request_state.get('request_details', {})
             summary.append({
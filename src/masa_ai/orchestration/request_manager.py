@@ -18,6 +18,7 @@ Attributes:
 
 import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from typing import Optional, List
 from masa_ai.orchestration.request_router import RequestRouter
@@ -26,6 +27,7 @@ from masa_ai.orchestration.state_manager import StateManager
 from ..tools.qc.qc_manager import QCManager
 from ..configs.config import global_settings
 from ..tools.utils.paths import ensure_dir, ORCHESTRATION_DIR
+from ..tools.utils import json_codec
 
 class RequestManager:
     """
@@ -78,15 +80,17 @@ class RequestManager:
             requests (list): List of requests.
         """
         self.qc_manager.log_debug("Updating state with new requests", context="RequestManager")
-        for request in requests:
-            request_id = self._generate_request_id(request)
-            if not self.state_manager.request_exists(request_id):
-                self.state_manager.update_request_state(request_id, 'queued', request_details=request)
+        self.state_manager.add_requests({self._generate_request_id(request): request for request in requests})
         self.qc_manager.log_info("Updated state with new requests")
 
     def _process_queue(self):
         """
         Process requests from the queue.
+
+        Up to ``request_manager.MAX_WORKERS`` requests are processed at the same
+        time on a thread pool, so their network waits overlap. The queue is only
+        read from this thread; a new request is taken from it whenever a worker
+        finishes.
         """
         queue_summary = self.queue.get_queue_summary()
         self.qc_manager.log_info("Queue Summary:")
@@ -96,26 +100,43 @@ class RequestManager:
         total_requests = len(queue_summary)
         self.qc_manager.log_info(f"Starting to process {total_requests} requests")
 
+        max_workers = max(1, self.config.get('request_manager.MAX_WORKERS', 1))
         processed_requests = 0
-        while True:
-            request_id, request = self.queue.get()
-            if request_id is None:
-                break
-
-            processed_requests += 1
-            self.qc_manager.log_info(f"Processing request {processed_requests} of {total_requests}", context="RequestManager")
-
-            try:
-                self._process_single_request(request_id, request)
-            except Exception as e:
-                self.qc_manager.log_error(f"Error processing request: {str(e)}", context="RequestManager")
-
+        inflight = set()
+        queue_drained = False
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="RequestWorker") as executor:
+                while True:
+                    while not queue_drained and len(inflight) < max_workers:
+                        request_id, request = self.queue.get()
+                        if request_id is None:
+                            queue_drained = True
+                            break
+
+                        processed_requests += 1
+                        self.qc_manager.log_info(f"Processing request {processed_requests} of {total_requests}", context="RequestManager")
+                        inflight.add(executor.submit(self._process_single_request, request_id, request))
+
+                    if not inflight:
+                        break
+                    done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        error = future.exception()
+                        if error is not None:
+                            self.qc_manager.log_error("Error processing request: %s", error, context="RequestManager")
+        finally:
+            # Write out the progress made so far even if processing is interrupted
+            self.state_manager.flush()
+            self.queue.flush()
         self.qc_manager.log_info(f"Completed processing all {total_requests} requests")
 
     def _process_single_request(self, request_id, request):
         """
         Process a single request.
 
+        The request is the one stored in the state manager when it was queued,
+        so the status updates below leave its request_details as they are.
+
         Args:
             request_id (str): The ID of the request.
             request (dict): The request to process.
@@ -129,24 +150,27 @@ class RequestManager:
             self.qc_manager.log_error(f"Request {request_id} not found in the state manager", context="RequestManager")
             return
 
-        self.qc_manager.log_debug(f"Processing request {request_id}, Current status: {current_state['status']}", context="RequestManager")
+        self.qc_manager.log_debug("Processing request %s, Current status: %s", request_id, current_state['status'], context="RequestManager")
 
         if current_state['status'] != 'in_progress':
-            self.state_manager.update_request_state(request_id, 'in_progress', request_details=request)
+            self.state_manager.update_request_state(request_id, 'in_progress')
 
         try:
             result = self.request_router.route_request(request_id, request)
-            self.state_manager.update_request_state(request_id, 'completed', result=result, request_details=request)
+            self.state_manager.update_request_state(request_id, 'completed', result=result)
             self.qc_manager.log_info(f"Request completed: {request_id}")
         except Exception as e:
-            self.qc_manager.log_error(f"Error in request {request_id}: {str(e)}")
-            self.state_manager.update_request_state(request_id, 'failed', error=str(e), request_details=request)
+            self.qc_manager.log_error("Error in request %s: %s", request_id, e, context="RequestManager")
+            self.state_manager.update_request_state(request_id, 'failed', error=str(e))
             raise
 
     def _generate_request_id(self, request):
         """
         Generate a unique request ID based on the request content.
 
+        IDs are persisted as state keys, so the serialization and hash must stay
+        stable for resubmitted requests to match their existing state.
+
         Args:
             request (dict): The request dictionary.
 
@@ -154,7 +178,7 @@ class RequestManager:
             str: The generated request ID.
         """
         request_copy = request.copy()
-        request_copy.pop('id', None) 
+        request_copy.pop('id', None)
         request_json = json.dumps(request_copy, sort_keys=True).encode('utf-8')
         return hashlib.sha256(request_json).hexdigest()
 
@@ -165,26 +189,46 @@ class RequestManager:
         Args:
             request_list_file (str): Path to the JSON file containing requests.
         """
-        request_list = self.load_request_list(request_list_file)
         self.qc_manager.log_info("Existing requests in the queue:", context="RequestManager")
-        for request in request_list:
+        for request_id, request_type, request_status in self.build_queue_preview(request_list_file):
+            self.qc_manager.log_info(f"Request ID: {request_id}, Type: {request_type}, Status: {request_status}", context="RequestManager")
+
+        action = input("Enter the action to take on the request queue (process/cancel/skip): ")
+        self.apply_action(action, request_list_file)
+
+    def build_queue_preview(self, request_list_file):
+        """
+        Summarize the requests in a request list file.
+
+        Args:
+            request_list_file (str): Path to the JSON file containing requests.
+
+        Returns:
+            list: A (request_id, type, status) tuple for each valid request.
+        """
+        preview = []
+        for request in self.load_request_list(request_list_file):
             if request is None:
                 self.qc_manager.log_error("Skipping invalid request: None", context="RequestManager")
                 continue
-            if 'id' not in request:
-                request_id = self._generate_request_id(request)
-                request['id'] = request_id
-            request_id = request['id']
-            request_type = request.get('type', 'Unknown')
-            request_status = request.get('status', 'Unknown')
-            self.qc_manager.log_info(f"Request ID: {request_id}, Type: {request_type}, Status: {request_status}", context="RequestManager")
+            request_id = request.get('id') or self._generate_request_id(request)
+            preview.append((request_id, request.get('type', 'Unknown'), request.get('status', 'Unknown')))
+        return preview
 
-        action = input("Enter the action to take on the request queue (process/cancel/skip): ")
-        if action.lower() == 'process':
-            self.process_requests(request_list_file)
-        elif action.lower() == 'cancel':
+    def apply_action(self, action, request_list_file):
+        """
+        Apply an action to the requests in a request list file.
+
+        Args:
+            action (str): The action to take, one of 'process', 'cancel' or 'skip'.
+            request_list_file (str): Path to the JSON file containing requests.
+        """
+        action = action.lower()
+        if action == 'process':
+            self.process_requests(self.load_request_list(request_list_file))
+        elif action == 'cancel':
             self.cancel_request_queue(request_list_file)
-        elif action.lower() == 'skip':
+        elif action == 'skip':
             self.qc_manager.log_info("Skipping request queue processing.", context="RequestManager")
         else:
             self.qc_manager.log_error("Invalid action. Please enter 'process', 'cancel', or 'skip'.", context="RequestManager")
@@ -200,14 +244,11 @@ class RequestManager:
             list: The loaded request list.
         """
         try:
-            request_list_path = Path(request_list_file)
-            with request_list_path.open('r') as file:
-                request_list = json.load(file)
-                return request_list
+            return json_codec.load_file(Path(request_list_file))
         except FileNotFoundError:
             self.qc_manager.log_error(f"Request list file not found: {request_list_file}", context="RequestManager")
             return []
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             self.qc_manager.log_error(f"Error decoding request list JSON: {str(e)}", error_info=e, context="RequestManager")
             return []
 
@@ -218,15 +259,14 @@ class RequestManager:
         Returns:
             list: The list of in-progress or queued requests.
         """
-        all_requests = self.state_manager.get_all_requests_state()
+        active_requests = self.state_manager.get_active_requests()
         in_progress = []
-        for request_id, request_state in all_requests.items():
-            if request_state.get('status') in ['in_progress', 'queued']:
-                original_request = request_state.get('original_request')
-                if original_request:
-                    in_progress.append(original_request)
-                else:
-                    self.qc_manager.log_debug(f"Invalid in-progress request state: {request_state}", context="RequestManager")
+        for request_id, request_state in active_requests.items():
+            request_details = request_state.get('request_details')
+            if request_details:
+                in_progress.append({**request_details, 'id': request_id})
+            else:
+                self.qc_manager.log_debug(f"Invalid in-progress request state: {request_state}", context="RequestManager")
         self.qc_manager.log_debug(f"Found {len(in_progress)} in-progress or queued requests", context="RequestManager")
         return in_progress
 
@@ -234,16 +274,17 @@ class RequestManager:
         """
         Add a request to the system.
 
+        Queueing the request also marks it as queued in the state manager.
+
         Args:
             request (dict): The request to add.
         """
         
         request_id = request['id']
-        self.qc_manager.log_debug(f"Adding request {request_id} to system", context="RequestManager")
+        self.qc_manager.log_debug("Adding request %s to system", request_id, context="RequestManager")
         
         self.queue.add(request)
-        self.state_manager.update_request_state(request_id, 'queued', request_details=request)
-        self.qc_manager.log_debug(f"Request {request_id} added to queue and state updated", context="RequestManager")
+        self.qc_manager.log_debug("Request %s added to queue and state updated", request_id, context="RequestManager")
 
     def get_request_status(self, request_id):
         """
@@ -286,14 +327,17 @@ class RequestManager:
         """
         Resume incomplete requests (in progress, queued, or failed).
         """
-        all_requests = self.state_manager.get_all_requests_state()
-        for request_id, request_state in all_requests.items():
-            if request_state.get('status') in ['in_progress', 'queued', 'failed']:
-                original_request = request_state.get('original_request')
-                if original_request:
-                    self.add_request(original_request)
-                else:
-                    self.qc_manager.log_debug(f"Invalid in-progress request state: {request_state}", context="RequestManager")
+        if self.queue is None:
+            self.queue = Queue(self.state_manager, self.queue_file)
+        incomplete_requests = self.state_manager.get_requests_by_status(['in_progress', 'queued', 'failed'])
+        requests = []
+        for request_id, request_state in incomplete_requests.items():
+            request_details = request_state.get('request_details')
+            if request_details:
+                requests.append({**request_details, 'id': request_id})
+            else:
+                self.qc_manager.log_debug(f"Invalid in-progress request state: {request_state}", context="RequestManager")
+        self.queue.add_many(requests)
         self.qc_manager.log_debug(f"Resumed incomplete requests. Current queue size: {len(self.queue)}", context="RequestManager")
 
     def cancel_request_queue(self, request_list_file):
@@ -324,6 +368,8 @@ class RequestManager:
         request_state = self.state_manager.get_request_state(request_id)
         if request_state:
             self.state_manager.update_request_state(request_id, 'cancelled')
+            if self.queue:
+                self.queue.remove(request_id)
             self.qc_manager.log_info(f"Cancelled request {request_id}", context="RequestManager")
         else:
             self.qc_manager.log_warning(f"Request {request_id} not found in the state manager", context="RequestManager")
@@ -374,6 +420,7 @@ class RequestManager:
         self.qc_manager.log_debug("Clearing requests", context="RequestManager")
         self.state_manager.load_state()
         self.state_manager.clear_requests(request_ids)
+        self.state_manager.flush()
         if request_ids:
             self.qc_manager.log_info(f"Cleared requests with IDs: {', '.join(request_ids)}", context="RequestManager")
         else:
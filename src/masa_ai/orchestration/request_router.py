@@ -7,6 +7,7 @@ routing requests to the appropriate scraper based on the request parameters.
 
 from ..tools.scrape.scrape_xtwitter import XTwitterScraper
 from ..tools.qc.qc_manager import QCManager
+import threading
 import traceback
 from ..configs.config import global_settings
 
@@ -37,6 +38,7 @@ class RequestRouter:
         self.config = global_settings
         self.state_manager = state_manager
         self.scrapers = {}
+        self._scrapers_lock = threading.Lock()
     
     def route_request(self, request_id, request):
         """
@@ -46,8 +48,8 @@ class RequestRouter:
         :type request_id: str
         :param request: Dictionary containing the request parameters.
         :type request: dict
-        :return: The result of processing the request.
-        :rtype: dict
+        :return: The result of processing the request as (records_fetched, api_calls_count).
+        :rtype: tuple
         :raises ValueError: If an unknown scraper or endpoint is specified.
         """
 
@@ -56,22 +58,22 @@ class RequestRouter:
         params = request['params']
 
         query = params.get('query', 'N/A')
-        self.qc_manager.log_debug(f"Request details: Query '{query}' {request}", context="RequestRouter")
+        self.qc_manager.log_debug("Request details: Query '%s' %s", query, request, context="RequestRouter")
 
         try:
-            self.qc_manager.log_debug(f"Routing request: {request_id} to {scraper_name} for endpoint {endpoint}", context="RequestRouter")
+            self.qc_manager.log_debug("Routing request: %s to %s for endpoint %s", request_id, scraper_name, endpoint, context="RequestRouter")
 
             if scraper_name == 'XTwitterScraper':
                 if endpoint == 'data/twitter/tweets/recent':
                     scraper = self.get_scraper(scraper_name, request)
-                    self.qc_manager.log_debug(f"Calling scrape_tweets for request: Query '{query}' (ID: {request_id})", context="RequestRouter")
+                    self.qc_manager.log_debug("Calling scrape_tweets for request: Query '%s' (ID: %s)", query, request_id, context="RequestRouter")
                     
                     # Ensure 'query' and 'count' are present in the params
                     if 'query' not in params or 'count' not in params:
                         raise ValueError("Missing 'query' or 'count' parameter in the request")
                     
                     result = scraper.scrape_tweets(request_id, params['query'], params['count'])
-                    self.qc_manager.log_debug(f"Completed request: Query '{query}' (ID: {request_id}).")
+                    self.qc_manager.log_debug("Completed request: Query '%s' (ID: %s).", query, request_id, context="RequestRouter")
                     return result
                 else:
                     raise ValueError(f"Unknown endpoint for {scraper_name}: {endpoint}")
@@ -87,6 +89,9 @@ class RequestRouter:
         """
         Get the scraper object for a given scraper name.
 
+        Each scraper is created once and shared by all workers; creation is
+        serialized so concurrent first requests do not build it twice.
+
         :param scraper_name: Name of the scraper.
         :type scraper_name: str
         :param request: Dictionary containing the request parameters.
@@ -95,9 +100,13 @@ class RequestRouter:
         :rtype: object
         :raises ValueError: If an unknown scraper name is provided.
         """
-        if scraper_name not in self.scrapers:
-            if scraper_name == 'XTwitterScraper':
-                self.scrapers[scraper_name] = XTwitterScraper(self.state_manager, request)
-            else:
-                raise ValueError(f"Unknown scraper: {scraper_name}")
-        return self.scrapers[scraper_name]
\ No newline at end of file
+        scraper = self.scrapers.get(scraper_name)
+        if scraper is None:
+            with self._scrapers_lock:
+                scraper = self.scrapers.get(scraper_name)
+                if scraper is None:
+                    if scraper_name == 'XTwitterScraper':
+                        scraper = self.scrapers[scraper_name] = XTwitterScraper(self.state_manager, request)
+                    else:
+                        raise ValueError(f"Unknown scraper: {scraper_name}")
+        return scraper
\ No newline at end of file
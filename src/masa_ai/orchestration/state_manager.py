@@ -8,21 +8,39 @@ The StateManager class handles the state transitions of requests and maintains
 consistency with the priority queue implementation. It provides methods
 for updating, retrieving, and removing request states.
 
+State changes are applied in memory and marked dirty. A background flusher
+groups the changes made within a short window, or until FLUSH_BATCH_SIZE
+requests have changed, into one write and fsync; an explicit flush() or
+interpreter exit does the same. Changed request entries are appended to a
+write-ahead log next to the state file. The log is folded back into a full
+snapshot once it grows past MAX_WAL_SIZE bytes or MAX_WAL_ENTRIES records, or
+past the size of the snapshot itself for large states, so the cost of
+rewriting the snapshot stays proportional to the changes logged since the
+last one. A log record leaves out the request_details of a request whose
+details have not changed, so status transitions only log the small, mutable
+part of its entry.
+
 Attributes:
     _state_file (str): File path to store the state data.
-    _lock (threading.Lock): Lock for thread-safe operations.
+    _lock (threading.Lock): Lock guarding the in-memory state.
+    _write_lock (threading.Lock): Lock serializing writes to the state and log files.
     qc_manager (tools.qc.qc_manager.QCManager): Quality control manager for logging.
     _state (dict): In-memory representation of the current state.
 """
 
-import json
+import os
 import threading
+from collections import defaultdict
 from pathlib import Path
-from datetime import datetime
 from ..tools.qc.qc_manager import QCManager
-from ..tools.utils.paths import ensure_dir
+from ..tools.utils.paths import ensure_dir, atomic_write
+from ..tools.utils.helper_functions import now_iso
+from ..tools.utils import json_codec
+from ..tools.utils.background_flusher import BackgroundFlusher, register_exit_flush
+from ..tools.utils.append_log import AppendLog
 from typing import Optional, List
 
+
 class StateManager:
     """
     Class for managing the state of requests.
@@ -33,116 +51,482 @@ class StateManager:
 
     Attributes:
         _state_file (str): File path to store the state data.
-        _lock (threading.Lock): Lock for thread-safe operations.
+        _lock (threading.Lock): Lock guarding the in-memory state.
+        _write_lock (threading.Lock): Lock serializing writes to the state and log files.
         qc_manager (tools.qc.qc_manager.QCManager): Quality control manager for logging.
         _state (dict): In-memory representation of the current state.
+        _dirty (bool): Whether the in-memory state has changes not yet written to disk.
+        _flush_interval (float): Seconds the background flusher waits to group changes, or None to disable it.
+        _wal_file (Path): Append-only log of request entries changed since the last snapshot.
     """
 
-    def __init__(self, state_file: Path):
+    FLUSH_BATCH_SIZE = 50
+    MAX_WAL_SIZE = 1024 * 1024
+    MAX_WAL_ENTRIES = 1000
+
+    def __init__(self, state_file: Path, flush_interval: Optional[float] = 0.02):
         """
         Initialize the StateManager.
 
         :param state_file: File path to store the state data.
         :type state_file: Path
+        :param flush_interval: Seconds the background flusher waits after a change
+            so that later changes share the same write. If None, the state is only
+            written on flush() or at exit.
+        :type flush_interval: float, optional
         """
         self._state_file = state_file
         self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self.qc_manager = QCManager()
         
         # Ensure the directory exists
         self._state_file.parent.mkdir(parents=True, exist_ok=True)
         
+        self._wal_file = self._state_file.with_name(self._state_file.name + '.wal')
+        self._wal = AppendLog(self._wal_file)
         self._state = None
+        self._dirty = False
+        self._dirty_requests = set()
+        self._dirty_details = set()
+        self._by_status = None
+        self._indexed_state = None
+        self._encoded_requests = {}
+        self._encoded_state = None
+        self._wal_generation = 0
+        self._wal_entries = 0
+        self._wal_size = 0
+        self._snapshot_size = 0
+        self._flush_interval = flush_interval
+        self._flusher = BackgroundFlusher(self, flush_interval, "StateManagerFlusher") if flush_interval else None
+        register_exit_flush(self)
+
+    def flush(self):
+        """Write any unsaved changes to disk."""
+        with self._write_lock:
+            self._write_pending()
+
+    def _mark_dirty(self, request_id):
+        """Record that a request entry changed. Must be called with the lock held."""
+        self._dirty_requests.add(request_id)
+        self._encoded_requests.pop(request_id, None)
+        self._dirty = True
+        if self._flusher:
+            self._flusher.notify(batch_full=len(self._dirty_requests) >= self.FLUSH_BATCH_SIZE)
+
+    def _status_index(self):
+        """
+        Get the index of request IDs by status, rebuilding it if the state was replaced.
+
+        Each status maps to a dict used as an insertion-ordered set of request IDs.
+        Must be called with the lock held.
+
+        Returns:
+            defaultdict: The request IDs keyed by status.
+        """
+        if self._indexed_state is not self._state:
+            index = defaultdict(dict)
+            for request_id, request_state in self._state['requests'].items():
+                index[request_state.get('status')][request_id] = None
+            self._by_status = index
+            self._indexed_state = self._state
+        return self._by_status
+
+    def _reindex(self, request_id, old_status, new_status):
+        """Move a request between statuses in the status index. Must be called with the lock held."""
+        if old_status != new_status:
+            index = self._status_index()
+            index[old_status].pop(request_id, None)
+            if new_status is not None:
+                index[new_status][request_id] = None
+
+    def _write_pending(self, snapshot=False):
+        """
+        Append the changed request entries to the write-ahead log.
+
+        Falls back to a full snapshot when requested, when no snapshot exists yet
+        or when the log has grown past its limits. Snapshots are compact, or
+        indented for readability when debug logging is enabled. The data is
+        encoded under the state lock, which is released before the disk write so
+        readers and writers of the in-memory state never wait on the fsync. Must
+        be called with the write lock held.
+
+        Args:
+            snapshot (bool): Whether to write a full snapshot regardless of the log.
+        """
+        with self._lock:
+            if self._state is None or not (self._dirty or snapshot):
+                return
+            request_ids, self._dirty_requests = self._dirty_requests, set()
+            details_ids, self._dirty_details = self._dirty_details, set()
+            self._dirty = False
+            snapshot = (snapshot
+                        or not self._state_file.exists()
+                        or self._wal_entries >= max(self.MAX_WAL_ENTRIES, len(self._state['requests']))
+                        or self._wal_size >= max(self.MAX_WAL_SIZE, self._snapshot_size))
+            if snapshot:
+                generation = self._wal_generation + 1
+                data = self._encode_snapshot(generation)
+            else:
+                requests = self._state['requests']
+                last_updated = self._state.get('last_updated')
+                data = b''.join(
+                    self._encode_wal_record(request_id, requests.get(request_id), request_id not in details_ids, last_updated)
+                    for request_id in request_ids
+                )
+
+        try:
+            if snapshot:
+                self._write_snapshot(data, generation)
+            else:
+                self._wal.append(data)
+                self._wal_entries += len(request_ids)
+                self._wal_size += len(data)
+                self.qc_manager.log_debug("Appended state changes to write-ahead log", context="StateManager")
+        except OSError:
+            with self._lock:
+                self._dirty_requests |= request_ids
+                self._dirty_details |= details_ids
+                self._dirty = True
+            raise
+
+    def _encode_snapshot(self, generation):
+        """
+        Encode the state as a snapshot. Must be called with the lock held.
+
+        Compact snapshots are assembled from the cached encoding of each request
+        entry, so only entries changed since they were last encoded are encoded
+        again. The chunks are written out in order rather than joined, so a
+        snapshot never holds a second copy of the encoded state in memory.
+        Indented debug snapshots are encoded in full.
+
+        Args:
+            generation (int): The write-ahead log generation stored in the snapshot.
+
+        Returns:
+            list: The chunks of the encoded snapshot.
+        """
+        if self.qc_manager.is_debug():
+            return [json_codec.dumps({**self._state, 'wal_generation': generation}, indent=True)]
+        if self._encoded_state is not self._state:
+            self._encoded_requests = {}
+            self._encoded_state = self._state
+        cache = self._encoded_requests
+        chunks = [b'{"requests":{']
+        for request_id, request_state in self._state['requests'].items():
+            encoded = cache.get(request_id)
+            if encoded is None:
+                encoded = cache[request_id] = json_codec.dumps(request_id) + b':' + json_codec.dumps(request_state)
+            chunks.append(encoded)
+            chunks.append(b',')
+        if len(chunks) > 1:
+            chunks.pop()
+        others = {key: value for key, value in self._state.items() if key != 'requests'}
+        others['wal_generation'] = generation
+        chunks.append(b'},' + json_codec.dumps(others)[1:])
+        return chunks
+
+    def _encode_wal_record(self, request_id, request_state, partial, last_updated):
+        """
+        Encode the write-ahead log record of a changed request entry.
+
+        Args:
+            request_id (str): ID of the request.
+            request_state (dict): The request entry, or None if it was removed.
+            partial (bool): Whether to leave out the unchanged request_details.
+            last_updated (str): The state's last_updated timestamp.
+
+        Returns:
+            bytes: The encoded record, terminated by a newline.
+        """
+        record = {'gen': self._wal_generation, 'id': request_id, 'state': request_state, 'ts': last_updated}
+        if partial and request_state and 'request_details' in request_state:
+            record['state'] = {key: value for key, value in request_state.items() if key != 'request_details'}
+            record['partial'] = True
+        return json_codec.dumps(record) + b'\n'
+
+    def close(self):
+        """Stop the background flusher and write any unsaved changes."""
+        if self._flusher:
+            self._flusher.stop()
+        self.flush()
+        self._wal.close()
 
     def load_state(self):
-        """Load the state data from the state file."""
-        self._state = self._load_state()
+        """Load the state data from the state file, flushing unsaved changes first."""
+        with self._write_lock:
+            self._write_pending()
+            state = self._load_state()
+            with self._lock:
+                self._state = state
 
     def _load_state(self):
         """
         Load the state data from the state file or create a new state if the file doesn't exist.
 
+        Entries in the write-ahead log that belong to the loaded snapshot are
+        replayed on top of it.
+
         Returns:
             dict: Loaded state data or default state if file doesn't exist or is invalid.
         """
+        state = None
         if self._state_file.exists():
             try:
-                with self._state_file.open('r') as file:
-                    state = json.load(file)
-                # Remove any 'null' entries
-                if 'requests' in state:
-                    state['requests'] = {k: v for k, v in state['requests'].items() if k != 'null'}
+                state = json_codec.load_file(self._state_file)
                 self.qc_manager.log_debug("State file loaded successfully", context="StateManager")
-                return state
-            except json.JSONDecodeError:
-                self.qc_manager.log_warning("Invalid JSON in state file. Creating new state.", context="StateManager")
+            except json_codec.JSONDecodeError:
+                corrupt_file = self._state_file.with_name(self._state_file.name + '.corrupt')
+                os.replace(self._state_file, corrupt_file)
+                self.qc_manager.log_warning(f"Invalid JSON in state file, moved to {corrupt_file}. Creating new state.", context="StateManager")
         else:
             self.qc_manager.log_info("State file not found. Creating new state.", context="StateManager")
-        
-        # Return default state if file doesn't exist or is invalid
-        return {'requests': {}, 'last_updated': datetime.now().isoformat()}
+
+        if state is None:
+            # Use default state if file doesn't exist or is invalid
+            state = {'requests': {}, 'last_updated': now_iso()}
+        state.setdefault('requests', {})
+        self._wal_generation = state.pop('wal_generation', 0)
+        self._wal.close()
+        self._wal_entries = self._replay_wal(state)
+        self._wal_size = self._wal_file.stat().st_size if self._wal_file.exists() else 0
+        self._snapshot_size = self._state_file.stat().st_size if self._state_file.exists() else 0
+
+        # Remove any 'null' entries
+        state['requests'] = {k: v for k, v in state['requests'].items() if k != 'null'}
+        return state
+
+    def _replay_wal(self, state):
+        """
+        Apply the write-ahead log of the current snapshot generation to a state.
+
+        Partial records keep the request_details already stored for the request.
+        Replay stops at the first incomplete record, e.g. one cut short by a crash.
+
+        Args:
+            state (dict): The snapshot state to update in place.
+
+        Returns:
+            int: The number of records replayed.
+        """
+        if not self._wal_file.exists():
+            return 0
+        replayed = 0
+        with self._wal_file.open('rb') as file:
+            for line in file:
+                try:
+                    record = json_codec.loads(line)
+                except json_codec.JSONDecodeError:
+                    self.qc_manager.log_warning("Truncated record in write-ahead log. Ignoring the rest.", context="StateManager")
+                    break
+                if record.get('gen') != self._wal_generation:
+                    continue
+                if record['state'] is None:
+                    state['requests'].pop(record['id'], None)
+                else:
+                    if record.get('partial'):
+                        previous = state['requests'].get(record['id'], {})
+                        if 'request_details' in previous:
+                            record['state']['request_details'] = previous['request_details']
+                    state['requests'][record['id']] = record['state']
+                if record.get('ts'):
+                    state['last_updated'] = record['ts']
+                replayed += 1
+        self.qc_manager.log_debug("Replayed %d write-ahead log records", replayed, context="StateManager")
+        return replayed
 
     def _save_state(self):
-        """Save the current state data to the state file."""
+        """Save the current state data to the state file as a full snapshot."""
+        with self._write_lock:
+            self._write_pending(snapshot=True)
+
+    def _write_snapshot(self, data, generation):
+        """
+        Write an encoded snapshot to the state file.
+
+        The state is written to a temporary file which then replaces the state file,
+        so a crash mid-write never leaves a truncated state file behind. The
+        write-ahead log is emptied afterwards; the snapshot carries a new
+        generation so any log records left by a crash in between are ignored.
+        Must be called with the write lock held.
+
+        Args:
+            data (list): The chunks of the encoded state.
+            generation (int): The write-ahead log generation stored in the snapshot.
+        """
         self.qc_manager.log_debug("Saving state to file", context="StateManager")
-        with self._state_file.open('w') as file:
-            json.dump(self._state, file, indent=4)
+        atomic_write(self._state_file, data, drop_cache=True)
+        self._snapshot_size = sum(map(len, data))
+        self._wal_generation = generation
+        self._wal.remove()
+        self._wal_entries = 0
+        self._wal_size = 0
         self.qc_manager.log_debug("State saved successfully", context="StateManager")
 
     def update_request_state(self, request_id, status, progress=None, result=None, error=None, request_details=None):
         """
         Update the state of a request.
 
+        Updates that would not change any stored field are ignored, so they do
+        not touch last_updated or cause a write.
+
         Args:
             request_id (str): ID of the request.
             status (str): New status of the request.
             progress (dict, optional): Progress data of the request.
-            result (dict, optional): Result data of the request.
+            result (tuple, optional): Result of the request as (records_fetched, api_calls_count).
             error (str, optional): Error data of the request.
             request_details (dict, optional): Original request data.
         """
-        self.qc_manager.log_debug(f"Updating state for request ID: {request_id}, status: {status}", context="StateManager")
+        self.qc_manager.log_debug("Updating state for request ID: %s, status: %s", request_id, status, context="StateManager")
+        updates = self._build_updates(status, progress, result, request_details)
         with self._lock:
-            current_time = datetime.now().isoformat()
-            if request_id not in self._state['requests']:
-                self._state['requests'][request_id] = {
-                    'status': status,
-                    'created_at': current_time,
-                    'last_updated': current_time,
-                }
-            else:
-                self._state['requests'][request_id]['status'] = status
-                self._state['requests'][request_id]['last_updated'] = current_time
+            current_time = now_iso()
+            if self._apply_updates(request_id, updates, current_time):
+                self._state['last_updated'] = current_time
+                self.qc_manager.log_debug("State updated for request %s", request_id, context="StateManager")
 
-            if request_details:
-                request_details_copy = request_details.copy()
-                request_details_copy.pop('status', None)
-                self._state['requests'][request_id]['request_details'] = request_details_copy
+    def update_requests_state(self, requests, status):
+        """
+        Set the status of several requests under a single acquisition of the lock.
+
+        Each request is updated as update_request_state would, with its
+        original data stored as its request_details.
 
-            if progress:
-                self._state['requests'][request_id]['progress'] = progress
+        Args:
+            requests (dict): Original request data keyed by request ID.
+            status (str): New status of the requests.
+        """
+        updated = 0
+        with self._lock:
+            current_time = now_iso()
+            for request_id, request_details in requests.items():
+                updates = self._build_updates(status, request_details=request_details)
+                updated += self._apply_updates(request_id, updates, current_time)
+            if updated:
+                self._state['last_updated'] = current_time
+        self.qc_manager.log_debug("Set %d of %d requests to %s", updated, len(requests), status, context="StateManager")
+
+    @staticmethod
+    def _build_updates(status, progress=None, result=None, request_details=None):
+        """
+        Build the fields to store for a request update.
 
-            if result:
-                # Store only the records fetched and API calls count from the result
-                result_summary = {
-                    'records_fetched': result[2],
-                    'api_calls_count': result[1]
+        Returns:
+            dict: The fields to update, keyed by name.
+        """
+        updates = {'status': status}
+        if request_details:
+            request_details_copy = request_details.copy()
+            request_details_copy.pop('status', None)
+            updates['request_details'] = request_details_copy
+        if progress:
+            updates['progress'] = progress
+        if result:
+            # Store only the records fetched and API calls count from the result
+            records_fetched, api_calls_count = result
+            updates['result'] = {
+                'records_fetched': records_fetched,
+                'api_calls_count': api_calls_count
+            }
+        return updates
+
+    def _apply_updates(self, request_id, updates, current_time):
+        """
+        Apply the fields to a request entry, creating it if needed. Must be called with the lock held.
+
+        Returns:
+            bool: Whether the entry changed.
+        """
+        request_state = self._state['requests'].get(request_id)
+        if request_state is None:
+            old_status = None
+            request_state = self._state['requests'][request_id] = {'status': updates['status'], 'created_at': current_time}
+        elif all(request_state.get(key) == value for key, value in updates.items()):
+            self.qc_manager.log_debug("State unchanged for request %s", request_id, context="StateManager")
+            return False
+        else:
+            old_status = request_state.get('status')
+
+        if 'request_details' in updates and request_state.get('request_details') != updates['request_details']:
+            self._dirty_details.add(request_id)
+        request_state.update(updates)
+        self._reindex(request_id, old_status, updates['status'])
+        request_state['last_updated'] = current_time
+        self._mark_dirty(request_id)
+        return True
+
+    def add_requests(self, requests, status='queued'):
+        """
+        Add several new requests under a single acquisition of the lock.
+
+        Requests that already exist are left untouched. The new entries match
+        those created by update_request_state.
+
+        Args:
+            requests (dict): Original request data keyed by request ID.
+            status (str, optional): Status of the new requests. Defaults to 'queued'.
+
+        Returns:
+            list: The IDs of the requests that were added.
+        """
+        added = []
+        with self._lock:
+            current_time = now_iso()
+            all_requests = self._state['requests']
+            for request_id, request_details in requests.items():
+                if request_id in all_requests:
+                    continue
+                request_details_copy = request_details.copy()
+                request_details_copy.pop('status', None)
+                all_requests[request_id] = {
+                    'status': status,
+                    'created_at': current_time,
+                    'request_details': request_details_copy,
+                    'last_updated': current_time
                 }
-                self._state['requests'][request_id]['result'] = result_summary
+                self._reindex(request_id, None, status)
+                self._dirty_details.add(request_id)
+                self._mark_dirty(request_id)
+                added.append(request_id)
+            if added:
+                self._state['last_updated'] = current_time
+        self.qc_manager.log_debug("Added %d new requests to state", len(added), context="StateManager")
+        return added
+
+    def update_progress(self, request_id, last_processed_time, save=True):
+        """
+        Update the progress checkpoint of a request without touching its other fields.
 
-            self._state['last_updated'] = current_time
-            self._save_state()
-            self.qc_manager.log_debug(f"State updated and saved for request {request_id}", context="StateManager")
+        Args:
+            request_id (str): ID of the request.
+            last_processed_time (str): ISO date of the next day to process.
+            save (bool, optional): Whether to write the state file immediately. Defaults to True.
+        """
+        with self._lock:
+            request_state = self._state['requests'].get(request_id)
+            if request_state is None:
+                self.qc_manager.log_warning(f"Attempt to update progress for non-existent request {request_id}", context="StateManager")
+                return
+            progress = request_state.setdefault('progress', {})
+            if progress.get('last_processed_time') != last_processed_time:
+                current_time = now_iso()
+                progress['last_processed_time'] = last_processed_time
+                request_state['last_updated'] = current_time
+                self._state['last_updated'] = current_time
+                self._mark_dirty(request_id)
+        if save:
+            self.flush()
 
     def get_all_requests_state(self):
         """
         Get the state of all requests.
 
         Returns:
-            dict: A dictionary containing the state of all requests, excluding any 'null' entries.
+            dict: A copy of the mapping of request IDs to their state, taken under the lock.
         """
         with self._lock:
-            return {k: v for k, v in self._state['requests'].items() if k != 'null'}
+            return self._state['requests'].copy()
 
     def get_request_state(self, request_id):
         """
@@ -154,7 +538,7 @@ class StateManager:
         Returns:
             dict: State data of the request or an empty dictionary if not found.
         """
-        self.qc_manager.log_debug(f"Retrieving state for request ID: {request_id}", context="StateManager")
+        self.qc_manager.log_debug("Retrieving state for request ID: %s", request_id, context="StateManager")
         with self._lock:
             state = self._state['requests'].get(request_id)
             if state is None:
@@ -169,9 +553,12 @@ class StateManager:
         :param request_id: ID of the request to remove.
         """
         with self._lock:
-            self._state['requests'].pop(request_id, None)
-            self._state['last_updated'] = datetime.now().isoformat()
-            self._save_state()
+            request_state = self._state['requests'].pop(request_id, None)
+            if request_state is not None:
+                self._reindex(request_id, request_state.get('status'), None)
+            self._state['last_updated'] = now_iso()
+            self._dirty_details.add(request_id)
+            self._mark_dirty(request_id)
 
     def update_request_priority(self, request_id, priority):
         """
@@ -182,10 +569,12 @@ class StateManager:
         """
         with self._lock:
             if request_id in self._state['requests']:
+                if self._state['requests'][request_id].get('priority') == priority:
+                    return
                 self._state['requests'][request_id]['priority'] = priority
-                self._state['requests'][request_id]['last_updated'] = datetime.now().isoformat()
-                self._save_state()
-                self.qc_manager.log_debug(f"Priority updated for request {request_id}", context="StateManager")
+                self._state['requests'][request_id]['last_updated'] = now_iso()
+                self._mark_dirty(request_id)
+                self.qc_manager.log_debug("Priority updated for request %s", request_id, context="StateManager")
             else:
                 self.qc_manager.log_warning(f"Attempt to update priority for non-existent request {request_id}", context="StateManager")
 
@@ -208,10 +597,7 @@ class StateManager:
         Returns:
             dict: A dictionary of active requests, keyed by request ID.
         """
-        return {
-            k: v for k, v in self._state['requests'].items()
-            if v.get('status') in ['queued', 'in_progress']
-        }
+        return self.get_requests_by_status(['in_progress', 'queued'])
 
     def clear_requests(self, request_ids: Optional[List[str]] = None) -> None:
         """
@@ -222,25 +608,27 @@ class StateManager:
                                                If None, clears all queued or in-progress requests.
         """
         with self._lock:
-            current_time = datetime.now().isoformat()
+            current_time = now_iso()
             if request_ids is None:
                 # Clear all queued or in-progress requests
-                for request_id, request_data in self._state['requests'].items():
-                    if request_data.get('status') in ['queued', 'in_progress']:
-                        request_data['status'] = 'cancelled'
-                        request_data['last_updated'] = current_time
+                index = self._status_index()
+                request_ids = list(index['queued']) + list(index['in_progress'])
             else:
                 # Clear specified requests
-                for request_id in request_ids:
-                    if request_id in self._state['requests']:
-                        self._state['requests'][request_id]['status'] = 'cancelled'
-                        self._state['requests'][request_id]['last_updated'] = current_time
-                    else:
-                        self.qc_manager.log_warning(f"Request ID {request_id} not found.", context="StateManager")
-
-            # Update the last_updated timestamp and save the state
+                missing = [request_id for request_id in request_ids if request_id not in self._state['requests']]
+                for request_id in missing:
+                    self.qc_manager.log_warning(f"Request ID {request_id} not found.", context="StateManager")
+                request_ids = [request_id for request_id in request_ids if request_id in self._state['requests']]
+
+            for request_id in request_ids:
+                request_data = self._state['requests'][request_id]
+                self._reindex(request_id, request_data.get('status'), 'cancelled')
+                request_data['status'] = 'cancelled'
+                request_data['last_updated'] = current_time
+                self._mark_dirty(request_id)
+
+            # Update the last_updated timestamp
             self._state['last_updated'] = current_time
-            self._save_state()
 
     def get_requests_by_status(self, statuses: Optional[List[str]] = None) -> dict:
         """
@@ -255,9 +643,10 @@ class StateManager:
         with self._lock:
             if statuses is None:
                 return self._state['requests'].copy()
-            else:
-                return {
-                    request_id: data
-                    for request_id, data in self._state['requests'].items()
-                    if data.get('status') in statuses
-                }
\ No newline at end of file
+            index = self._status_index()
+            requests = self._state['requests']
+            return {
+                request_id: requests[request_id]
+                for status in statuses
+                for request_id in index.get(status, ())
+            }
\ No newline at end of file
@@ -5,6 +5,7 @@ This module provides the QCManager class, which centralizes quality control
 tasks such as logging, error handling, and retry management.
 """
 
+import logging
 import traceback
 import inspect
 
@@ -70,12 +71,16 @@ class QCManager:
         self.error_handler = ErrorHandler(self)
         self.retry_manager = RetryManager.RetryPolicy(global_settings, self)
 
-    def log_error(self, message, error_info=None, context=None):
+    def log_error(self, message, *args, error_info=None, context=None):
         """
         Log an error message.
 
+        Pass ``%``-style arguments in ``args`` to defer formatting of the message
+        to the logger, as with log_debug.
+
         Args:
-            message (str): The error message.
+            message (str): The error message, optionally with ``%``-style placeholders.
+            *args: Arguments merged into the message by the logger.
             error_info (Exception, optional): Additional error information.
             context (str, optional): The context of the error.
         """
@@ -92,7 +97,10 @@ class QCManager:
             lineno = getattr(error_info, 'lineno', 'Unknown')
             context = f"{context} - {filename}:{lineno}"
 
-        self.logger.error(f"{context}: {message}", exc_info=error_info)
+        if args:
+            self.logger.error("%s: " + message, context, *args, exc_info=error_info)
+        else:
+            self.logger.error(f"{context}: {message}", exc_info=error_info)
 
     def log_warning(self, message, context=None):
         """
@@ -117,17 +125,35 @@ class QCManager:
         context = context or ''
         self.logger.info(f"{context}: {message}")
 
-    def log_debug(self, message, context=None):
+    def is_debug(self):
+        """
+        Check whether debug messages are currently logged.
+
+        Returns:
+            bool: True if the logger is enabled for DEBUG.
+        """
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def log_debug(self, message, *args, context=None):
         """
         Log a debug message.
 
+        Nothing is formatted when DEBUG is disabled. Pass ``%``-style arguments
+        in ``args`` to defer formatting of the message itself to the logger.
+
         Args:
-            message (str): The debug message.
+            message (str): The debug message, optionally with ``%``-style placeholders.
+            *args: Arguments merged into the message by the logger.
             context (str, optional): The context of the debug message.
         """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         method_name = inspect.currentframe().f_back.f_code.co_name
         context = f"{context or ''} - {method_name}"
-        self.logger.debug(f"{context}: {message}")
+        if args:
+            self.logger.debug("%s: " + message, context, *args)
+        else:
+            self.logger.debug(f"{context}: {message}")
 
     def handle_error(self, custom_handlers=None):
         """
@@ -141,15 +141,18 @@ class RetryPolicy:
         """
         Wait for the specified time while showing a progress bar.
 
+        The thread sleeps until the next whole second of the wait, or the end of
+        it, and updates the bar once per wake-up.
+
         :param wait_time: The time to wait in seconds
         """
+        deadline = time.monotonic() + wait_time
         with tqdm(total=wait_time, desc="Wait Time", unit="s", leave=False) as pbar:
-            start_time = time.time()
-            while time.time() - start_time < wait_time:
-                time.sleep(0.2)
-                elapsed = time.time() - start_time
-                update_value = min(elapsed - pbar.n, wait_time - pbar.n)
-                pbar.update(update_value)
+            remaining = wait_time
+            while remaining > 0:
+                time.sleep(min(1.0, remaining))
+                remaining = deadline - time.monotonic()
+                pbar.update(wait_time - max(remaining, 0) - pbar.n)
             pbar.update(wait_time - pbar.n)
 
     def reload_configurations(self):
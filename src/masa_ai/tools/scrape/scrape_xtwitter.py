@@ -7,7 +7,7 @@ data storage.
 """
 
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import re
 from ...connections.xtwitter_connection import XTwitterConnection
 from masa_ai.tools.utils.data_storage import DataStorage
@@ -59,7 +59,8 @@ class XTwitterScraper:
             count (int): The number of tweets to scrape per API call.
 
         Returns:
-            tuple: A tuple containing the scraped tweets, API call count, and number of records fetched.
+            tuple: A tuple containing the number of records fetched and the API call count.
+            Tweets are persisted batch by batch and are not kept in memory.
 
         Raises:
             ConfigurationException: If required parameters are missing in the request.
@@ -67,8 +68,7 @@ class XTwitterScraper:
             RateLimitException: If the API rate limit is exceeded.
         """
         self.qc_manager.log_debug(f"Starting scrape_tweets for request: {request_id}", context="XTwitterScraper")
-        request = self.state_manager.get_request_state(request_id)
-        params = request.get('params', {})
+        request_state = self.state_manager.get_request_state(request_id)
         api_endpoint = self.request.get('endpoint')
         
 
@@ -94,8 +94,6 @@ class XTwitterScraper:
 
         days_per_iteration = global_settings.get('twitter.DAYS_PER_ITERATION', 1)
 
-        request_state = self.state_manager.get_request_state(request_id)
-        
         # Initialize current_date to end_date or the last processed time
         current_date = datetime.fromisoformat(
             request_state.get('progress', {}).get('last_processed_time', end_date.isoformat())
@@ -104,25 +102,30 @@ class XTwitterScraper:
         # Ensure current_date is not later than end_date
         current_date = min(current_date, end_date)
 
+        # Skip the loop entirely if the progress checkpoint is already past the window
+        if current_date < start_date:
+            result = request_state.get('result', {})
+            self.qc_manager.log_info(f"Request {request_id} already scraped for query: {query}. Skipping.", context="XTwitterScraper")
+            return result.get('records_fetched', 0), result.get('api_calls_count', 0)
+
         total_days = (end_date - start_date).days
 
         self.qc_manager.log_info(f"Starting tweet scraping for query: {query} over {total_days} days", context="XTwitterScraper")
 
-        all_tweets = []
         api_calls_count = 0
         records_fetched = 0
         days_processed = 0
 
-        while current_date >= start_date:
-            
-            iteration_end_date = current_date
-            iteration_start_date = current_date
+        start_ordinal = start_date.toordinal()
 
-            query_until_date = (iteration_end_date + timedelta(days=1)).strftime('%Y-%m-%d')
-            date_range_query = f"{cleaned_query} since:{iteration_start_date.strftime('%Y-%m-%d')} until:{query_until_date}"
+        for day_ordinal in range(current_date.toordinal(), start_ordinal - 1, -1):
+            iteration_date = date.fromordinal(day_ordinal)
+            since_date = iteration_date.isoformat()
+            until_date = date.fromordinal(day_ordinal + 1).isoformat()
+            date_range_query = f"{cleaned_query} since:{since_date} until:{until_date}"
             
-            self.qc_manager.log_debug(f"Processing date: {iteration_start_date}", context="XTwitterScraper")
-            self.qc_manager.log_debug(f"Calling twitter_connection.get_tweets with query: {date_range_query}, count: {count}, start_time: {current_date}, end_time: {current_date + timedelta(days=1)}", context="XTwitterScraper")
+            self.qc_manager.log_debug("Processing date: %s", since_date, context="XTwitterScraper")
+            self.qc_manager.log_debug("Calling twitter_connection.get_tweets with query: %s, count: %s, start_time: %s, end_time: %s", date_range_query, count, since_date, until_date, context="XTwitterScraper")
             
             try:
                 time_start = time.time()
@@ -131,43 +134,43 @@ class XTwitterScraper:
                 elapsed_time = time_end - time_start
 
                 self.tweet_stats.update_response_time(elapsed_time)
-                self.qc_manager.log_debug(f"API response time: {elapsed_time:.2f} seconds", context="XTwitterScraper")
+                self.qc_manager.log_debug("API response time: %.2f seconds", elapsed_time, context="XTwitterScraper")
                 
-                self.qc_manager.log_debug(f"Received response from API", context="XTwitterScraper")
+                self.qc_manager.log_debug("Received response from API", context="XTwitterScraper")
             
             except Exception as e:
                 self.qc_manager.log_error(f"API call failed: {str(e)}", context="XTwitterScraper")
                 raise
             
             api_calls_count += 1
-            new_records = self._handle_response(response, request_id, query, iteration_end_date, all_tweets, records_fetched)
+            new_records = self._handle_response(response, request_id, query, iteration_date, records_fetched)
             records_fetched += new_records
-            self.qc_manager.log_debug(f"Received {new_records} tweets from API, total records fetched: {records_fetched}", context="XTwitterScraper")
+            self.qc_manager.log_debug("Received %d tweets from API, total records fetched: %d", new_records, records_fetched, context="XTwitterScraper")
 
             days_processed += 1
-            progress_percentage = min(100, int((days_processed / total_days) * 100))
+            progress_percentage = min(100, int((days_processed / max(total_days, 1)) * 100))
             self.qc_manager.log_info(f"Tweet scraping progress: {progress_percentage}% ({records_fetched} tweets fetched)", context="XTwitterScraper")
 
-            current_date -= timedelta(days=1)
-            self.state_manager.update_request_state(request_id, 'in_progress', {'last_processed_time': current_date.isoformat()})
+            # The state manager's background flusher writes the checkpoint
+            self.state_manager.update_progress(request_id, date.fromordinal(day_ordinal - 1).isoformat(), save=False)
 
             # Pause for the configured success wait time before the next iteration
             success_wait_time = global_settings.get('twitter.SUCCESS_WAIT_TIME', 5)
 
-            self.qc_manager.log_debug(f"Pausing for {success_wait_time} seconds before the next iteration", context="XTwitterScraper")
+            self.qc_manager.log_debug("Pausing for %s seconds before the next iteration", success_wait_time, context="XTwitterScraper")
 
             time.sleep(success_wait_time)
 
             # Update and log scraping statistics
             self.qc_manager.log_info(self.tweet_stats.get_colored_stats(), context="TweetStats")
 
-       
+        self.state_manager.flush()
 
         self.qc_manager.log_info(f"Tweet scraping completed for query: {query} over {total_days} days. Total tweets: {records_fetched}, API calls: {api_calls_count}", context="XTwitterScraper")
-        return all_tweets, api_calls_count, records_fetched
+        return records_fetched, api_calls_count
 
     @QCManager().handle_error()
-    def _handle_response(self, response, request_id, query, current_date, all_tweets, records_fetched):
+    def _handle_response(self, response, request_id, query, current_date, records_fetched):
         """
         Handle the response from the XTwitter API.
 
@@ -178,13 +181,12 @@ class XTwitterScraper:
             request_id (str): The ID of the current request.
             query (str): The search query used for scraping tweets.
             current_date (datetime): The current date being processed.
-            all_tweets (list): The list to store all scraped tweets.
             records_fetched (int): The total number of records fetched so far.
 
         Returns:
             int: The number of new tweets processed from the API response.
         """
-        self.qc_manager.log_debug(f"Handling API response for request ID: {request_id}, query: {query}, date: {current_date}", context="XTwitterScraper")
+        self.qc_manager.log_debug("Handling API response for request ID: %s, query: %s, date: %s", request_id, query, current_date, context="XTwitterScraper")
         if response is None:
             
             self.qc_manager.log_error("Received empty response from API.", context="XTwitterScraper._handle_response")
@@ -193,26 +195,25 @@ class XTwitterScraper:
         if 'data' in response and response['data'] is not None:
 
             tweets = response['data']
-            all_tweets.extend(tweets)
             num_tweets = len(tweets)
             self._save_tweets(tweets, request_id, query, current_date)
 
-            self.qc_manager.log_debug(f"Scraped and saved {num_tweets} tweets for {query} on {current_date.strftime('%Y-%m-%d')}.", context="XTwitterScraper")
-            self.qc_manager.log_debug(f"Processed {num_tweets} tweets from the API response", context="XTwitterScraper")
+            self.qc_manager.log_debug("Scraped and saved %d tweets for %s on %s.", num_tweets, query, current_date, context="XTwitterScraper")
+            self.qc_manager.log_debug("Processed %d tweets from the API response", num_tweets, context="XTwitterScraper")
 
             self.tweet_stats.update(num_tweets, response.get('response_time', 0), response.get('worker_id', 'Unknown'))
 
             return num_tweets
         else:
-            self.qc_manager.log_debug(f"No tweets fetched for {query} on {current_date.strftime('%Y-%m-%d')}. Likely no results.", context="XTwitterScraper")
+            self.qc_manager.log_debug("No tweets fetched for %s on %s. Likely no results.", query, current_date, context="XTwitterScraper")
             return 0
 
     def _save_tweets(self, tweets, request_id, query, current_date):
         """
         Save the scraped tweets to storage.
 
-        This method saves the scraped tweets to the configured data storage
-        and updates the request state.
+        This method saves the scraped tweets to the configured data storage.
+        Progress is checkpointed once per iteration by the scraping loop.
 
         Args:
             tweets (list): The list of tweets to save.
@@ -224,14 +225,9 @@ class XTwitterScraper:
             DataProcessingException: If there's an error saving the tweets.
         """
         try:
-            self.data_storage.save_data(tweets, 'xtwitter', query, file_format='json')
+            self.data_storage.save_data(tweets, 'xtwitter', query, file_format='json', dedupe=True)
         except Exception as e:
             raise DataProcessingException(f"Failed to save tweets: {str(e)}")
-        
-        self.state_manager.update_request_state(request_id, 'in_progress', {
-            'last_processed_time': current_date.isoformat(),
-            'tweets_count': len(tweets)
-        })
 
     def _extract_date_range(self, query):
         """
@@ -3,17 +3,23 @@ The utils package contains utility modules for the application.
 
 This package includes the following modules:
 
+- `append_log`: Provides an append-only log file written through a single O_APPEND descriptor.
+- `background_flusher`: Provides a background thread that groups disk writes into one flush per window.
 - `data_storage`: Provides a generic class for handling data storage and retrieval.
 - `helper_functions`: Provides a collection of helper functions for data manipulation and processing.
+- `json_codec`: Provides JSON encoding and decoding backed by orjson when it is installed.
 - `paths`: Provides utility functions for working with file paths in the package.
+- `rate_limiter`: Provides a token bucket for client-side rate limiting of API calls.
 """
 
 from .data_storage import DataStorage
 from .helper_functions import *
 from .paths import *
+from .rate_limiter import TokenBucket
 
 __all__ = [
     'DataStorage',
     'helper_functions',
-    'paths'
+    'paths',
+    'TokenBucket'
 ]
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Append Log module for the MASA project.
+
+This module provides the AppendLog class, which appends records to a log file
+through a single file descriptor opened with O_APPEND, as used by the
+write-ahead logs of the orchestration layer.
+"""
+
+import os
+from pathlib import Path
+
+# fdatasync skips flushing metadata such as the modification time, which the
+# log does not need to recover its records; it is not available on all platforms.
+_sync = getattr(os, 'fdatasync', os.fsync)
+
+
+class AppendLog:
+    """
+    Append-only log file written with unbuffered, synced writes.
+
+    The file descriptor is opened on the first append and kept open, so each
+    append costs one write() and one fdatasync() instead of an open/write/close
+    round trip through a buffered file object.
+
+    Attributes:
+        path (Path): Path to the log file.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the AppendLog.
+
+        Args:
+            path (Path): Path to the log file.
+        """
+        self.path = Path(path)
+        self._fd = None
+
+    def append(self, data: bytes):
+        """
+        Append data to the log and sync it to disk.
+
+        Args:
+            data (bytes): The encoded records to append.
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        _sync(self._fd)
+
+    def close(self):
+        """Close the file descriptor, if open."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        """Close the file descriptor when the log is garbage collected."""
+        self.close()
+
+    def remove(self):
+        """Close and delete the log file."""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,104 @@
+"""
+Background Flusher module for the MASA project.
+
+This module provides the BackgroundFlusher class, which coalesces the disk
+writes of an object into a single flush per time window, and a registry that
+flushes such objects when the interpreter exits.
+
+Owners must provide a ``flush()`` method and a ``qc_manager`` attribute.
+"""
+
+import atexit
+import threading
+import weakref
+
+_exit_flush_owners = weakref.WeakSet()
+
+
+def register_exit_flush(owner):
+    """
+    Register an object whose ``flush()`` method is called at interpreter exit.
+
+    Args:
+        owner (object): The object to flush at exit. Only a weak reference is kept.
+    """
+    _exit_flush_owners.add(owner)
+
+
+@atexit.register
+def _flush_all_at_exit():
+    """Flush all registered objects that are still alive."""
+    for owner in list(_exit_flush_owners):
+        try:
+            owner.flush()
+        except OSError:
+            pass
+
+
+class BackgroundFlusher:
+    """
+    Daemon thread that groups the writes of an owner into one flush per window.
+
+    The thread sleeps until ``notify()`` is called, waits ``interval`` seconds so
+    that further changes land in the same write, and then calls ``owner.flush()``.
+    The wait is cut short when the owner reports that its batch is full.
+    Only a weak reference to the owner is held, so the thread exits once the
+    owner is garbage collected.
+
+    Attributes:
+        interval (float): Length of the coalescing window in seconds.
+    """
+
+    def __init__(self, owner, interval, name):
+        """
+        Initialize and start the BackgroundFlusher.
+
+        Args:
+            owner (object): The object to flush.
+            interval (float): Length of the coalescing window in seconds.
+            name (str): Name of the flusher thread.
+        """
+        self.interval = interval
+        self._pending = threading.Event()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        thread = threading.Thread(target=self._run, args=(weakref.ref(owner),), name=name, daemon=True)
+        thread.start()
+
+    def notify(self, batch_full=False):
+        """
+        Signal that the owner has unsaved changes.
+
+        Args:
+            batch_full (bool): Whether to flush now instead of waiting for the window to end.
+        """
+        self._pending.set()
+        if batch_full:
+            self._wake.set()
+
+    def stop(self):
+        """Stop the flusher thread without flushing."""
+        self._stopped.set()
+        self._pending.set()
+        self._wake.set()
+
+    def _run(self, owner_ref):
+        """Wait for changes and flush the owner once per window."""
+        while True:
+            if not self._pending.wait(1.0):
+                if owner_ref() is None:
+                    return
+                continue
+            self._wake.wait(self.interval)
+            if self._stopped.is_set():
+                return
+            self._wake.clear()
+            self._pending.clear()
+            owner = owner_ref()
+            if owner is None:
+                return
+            try:
+                owner.flush()
+            except OSError as e:
+                owner.qc_manager.log_error(f"Background flush failed: {str(e)}", error_info=e, context="BackgroundFlusher")
+            del owner
@@ -7,9 +7,46 @@ to files in various formats, primarily JSON and CSV.
 
 import os
 import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 import re
+from . import json_codec
+from .paths import atomic_write
 
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_ITEM_STARTS = re.compile(r'[,\[]')
+
+
+def _parse_list_items(text, position):
+    """
+    Parse the comma-separated items of a JSON list body from a position to the end of the text.
+
+    :param text: The JSON list body, without its closing bracket.
+    :type text: str
+    :param position: The offset of the first item.
+    :type position: int
+    :return: The parsed items, or None if the text from the position is not a list body.
+    :rtype: list
+    """
+    items = []
+    end = len(text)
+    position = _JSON_WHITESPACE.match(text, position).end()
+    if position == end:
+        return items
+    while True:
+        try:
+            item, position = _JSON_DECODER.raw_decode(text, position)
+        except ValueError:
+            return None
+        items.append(item)
+        position = _JSON_WHITESPACE.match(text, position).end()
+        if position == end:
+            return items
+        if text[position] != ',':
+            return None
+        position = _JSON_WHITESPACE.match(text, position + 1).end()
 
 
 class DataStorage:
@@ -20,10 +57,21 @@ class DataStorage:
     manage file paths for data storage.
     """
 
+    TAIL_WINDOW = 4096
+
     def __init__(self):
         """
         Initialize the DataStorage class.
         """
+        from ...configs.config import global_settings
+        self._dir_cache = set()
+        self._dir_cache_lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._seen = OrderedDict()
+        self._seeded_files = set()
+        self._seen_capacity = global_settings.get('data_storage.DEDUPE_CACHE_SIZE', 1_000_000)
+        self._seed_bytes = global_settings.get('data_storage.DEDUPE_SEED_BYTES', 4 * 1024 * 1024)
+        self._json_indent = global_settings.get('data_storage.JSON_INDENT', 4)
         self.data_directory = self._get_data_directory()
         self.ensure_dir(Path(self.data_directory))
         from ..qc.qc_manager import QCManager
@@ -47,10 +95,18 @@ class DataStorage:
         """
         Ensure that a directory exists.
 
+        Directories already created by this instance are remembered, so repeated
+        calls for the same directory skip the filesystem.
+
         :param directory: Path to the directory
         :type directory: Path
         """
-        directory.mkdir(parents=True, exist_ok=True)
+        if directory in self._dir_cache:
+            return
+        with self._dir_cache_lock:
+            if directory not in self._dir_cache:
+                directory.mkdir(parents=True, exist_ok=True)
+                self._dir_cache.add(directory)
 
     def get_file_path(self, source, query, file_format='json'):
         """
@@ -70,7 +126,7 @@ class DataStorage:
         filename = f"{self.sanitize_filename(query)}.{file_format}"
         return os.path.join(directory, filename)
 
-    def save_data(self, data, source, query, file_format='json'):
+    def save_data(self, data, source, query, file_format='json', dedupe=False):
         """
         Save data to a file.
 
@@ -82,13 +138,21 @@ class DataStorage:
         :type query: str
         :param file_format: The file format for storing the data. Defaults to 'json'.
         :type file_format: str
+        :param dedupe: Whether to skip records whose ID was already saved to the file. Defaults to False.
+        :type dedupe: bool
         :raises ValueError: If an unsupported file format is specified.
+
+        Saves are serialized, so requests processed on several threads can share
+        one DataStorage without interleaving writes to the same file.
         """
         file_path = self.get_file_path(source, query, file_format)
         
         try:
             if file_format == 'json':
-                self._save_json(file_path, data)
+                with self._write_lock:
+                    if dedupe and isinstance(data, list):
+                        data = self._drop_seen(file_path, data)
+                    self._save_json(file_path, data)
             elif file_format == 'csv':
                 self._save_csv(file_path, data)
             else:
@@ -99,6 +163,76 @@ class DataStorage:
             self.qc_manager.log_error(f"Error saving data: {str(e)}", error_info=e, context="DataStorage")
             raise
 
+    @staticmethod
+    def _record_key(record):
+        """
+        Get the deduplication key of a record.
+
+        The tweet ID is used, either at the top level or nested under ``Tweet``
+        as returned by the Masa node.
+
+        :param record: The record to key.
+        :type record: Any
+        :return: The deduplication key, or None if the record has no ID.
+        :rtype: str
+        """
+        if isinstance(record, dict):
+            tweet = record.get('Tweet')
+            if isinstance(tweet, dict) and tweet.get('ID') is not None:
+                return str(tweet['ID'])
+            for key in ('id', 'ID'):
+                if record.get(key) is not None:
+                    return str(record[key])
+        return None
+
+    def _drop_seen(self, file_path, data):
+        """
+        Remove records that were already saved to a file.
+
+        Record IDs are kept in a single LRU set shared by all files and capped at
+        ``data_storage.DEDUPE_CACHE_SIZE`` entries. The first time this instance
+        writes a file, the set is seeded from the records in the last
+        ``data_storage.DEDUPE_SEED_BYTES`` of it, so the cost of seeding does not
+        grow with the file. Records further back are not checked. Records
+        without an ID are always kept.
+
+        :param file_path: The file the records are saved to.
+        :type file_path: str
+        :param data: The records to filter.
+        :type data: list
+        :return: The records that have not been saved before.
+        :rtype: list
+        """
+        seen = self._seen
+        if file_path not in self._seeded_files:
+            self._seeded_files.add(file_path)
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as file:
+                    size = file.seek(0, os.SEEK_END)
+                    existing_data = self._read_tail_records(file, size, self._seed_bytes) if size else None
+                for record in (existing_data or ())[-self._seen_capacity:]:
+                    key = self._record_key(record)
+                    if key is not None:
+                        seen[(file_path, key)] = None
+
+        new_records = []
+        for record in data:
+            key = self._record_key(record)
+            if key is not None:
+                key = (file_path, key)
+                if key in seen:
+                    seen.move_to_end(key)
+                    continue
+                seen[key] = None
+            new_records.append(record)
+        while len(seen) > self._seen_capacity:
+            seen.popitem(last=False)
+
+        skipped = len(data) - len(new_records)
+        if skipped:
+            self.qc_manager.log_debug("Skipped %d duplicate records for %s", skipped, file_path, context="DataStorage")
+        return new_records
+
     def _save_json(self, file_path, data):
         """
         Save data to a JSON file. If the file already exists and contains valid JSON data,
@@ -110,21 +244,117 @@ class DataStorage:
         :param data: The data to be saved as JSON.
         :type data: Any
         """
+        if isinstance(data, list) and os.path.exists(file_path) and self._append_json_list(file_path, data):
+            return
+
         existing_data = []
         if os.path.exists(file_path):
-            with open(file_path, 'r') as file:
-                try:
-                    existing_data = json.load(file)
-                except json.JSONDecodeError:
-                    self.qc_manager.log_warning(f"Existing file {file_path} is not valid JSON. It will be overwritten.", context="DataStorage")
+            try:
+                existing_data = json_codec.load_file(file_path)
+            except json_codec.JSONDecodeError:
+                self.qc_manager.log_warning(f"Existing file {file_path} is not valid JSON. It will be overwritten.", context="DataStorage")
 
         if isinstance(existing_data, list) and isinstance(data, list):
             combined_data = existing_data + data
         else:
             combined_data = data  # If types don't match, use new data
 
-        with open(file_path, 'w') as file:
-            json.dump(combined_data, file, indent=4)
+        atomic_write(Path(file_path), json.dumps(combined_data, indent=self._json_indent).encode('utf-8'))
+
+    @staticmethod
+    def _read_tail_records(file, size, window):
+        """
+        Read the complete records at the end of a JSON list file.
+
+        The last ``window`` bytes are read, and the window is doubled until it
+        holds at least one complete record or covers the whole file. Records are
+        parsed from the first item boundary in the window after which the rest
+        of the list parses, so a record cut off by the start of the window is
+        left out. Only the whole file is checked once the window reaches its
+        start.
+
+        :param file: The JSON list file, opened in binary mode.
+        :type file: io.BufferedIOBase
+        :param size: The size of the file in bytes.
+        :type size: int
+        :param window: The number of bytes to read first.
+        :type window: int
+        :return: The records in the window, or None if the file does not end in a valid JSON list.
+        :rtype: list
+        """
+        while True:
+            start = max(0, size - window)
+            file.seek(start)
+            chunk = file.read()
+            if start:
+                # Drop the rest of a character cut by the start of the window
+                chunk = chunk.lstrip(bytes(range(0x80, 0xc0)))
+            try:
+                text = chunk.decode('utf-8').rstrip()
+            except UnicodeDecodeError:
+                return None
+            if not text.endswith(']'):
+                return None
+            body = text[:-1]
+
+            if start == 0:
+                opening = _JSON_WHITESPACE.match(body).end()
+                if not body.startswith('[', opening):
+                    return None
+                return _parse_list_items(body, opening + 1)
+            for match in _ITEM_STARTS.finditer(body):
+                records = _parse_list_items(body, match.end())
+                if records:
+                    return records
+            window *= 2
+
+    def _append_json_list(self, file_path, data):
+        """
+        Append items to an existing JSON list file in place.
+
+        Only the tail of the file is read and rewritten, so the cost of a save
+        depends on the size of the new batch rather than the size of the file.
+        The file must end in at least one complete record, or be a complete
+        list; otherwise the caller falls back to parsing and rewriting it.
+        The batch is encoded with a single ``json.dumps`` call and the output
+        matches what a full rewrite would produce. With ``data_storage.JSON_INDENT``
+        set to null the compact form is written, which uses the C-accelerated encoder.
+
+        :param file_path: The path of the existing JSON file.
+        :type file_path: str
+        :param data: The items to append.
+        :type data: list
+        :return: True if the items were appended, False if the file does not end in a valid JSON list.
+        :rtype: bool
+        """
+        with open(file_path, 'rb+') as file:
+            if not file.read(64).lstrip().startswith(b'['):
+                return False
+
+            size = file.seek(0, os.SEEK_END)
+            if self._read_tail_records(file, size, self.TAIL_WINDOW) is None:
+                return False
+            tail_start = max(0, size - self.TAIL_WINDOW)
+            file.seek(tail_start)
+            tail = file.read().rstrip()
+            if not tail.endswith(b']'):
+                return False
+            before_close = tail[:-1].rstrip()
+            if not before_close:
+                return False
+
+            if not data:
+                return True
+
+            items = json.dumps(data, indent=self._json_indent)[1:-1].strip('\n')
+            if self._json_indent is None:
+                separator, closing = ('' if before_close.endswith(b'[') else ', '), ']'
+            else:
+                separator, closing = ('\n' if before_close.endswith(b'[') else ',\n'), '\n]'
+            file.seek(tail_start + len(before_close))
+            file.truncate()
+            file.write(f"{separator}{items}{closing}".encode('utf-8'))
+        return True
 
     def _save_csv(self, file_path, data):
         """
@@ -6,8 +6,12 @@ These functions provide common operations that are not specific to any particula
 module but are useful across the project.
 """
 
+import time
+from datetime import datetime
 from urllib.parse import urljoin
 
+_timestamp_cache = (None, '')
+
 def format_url(base_url, endpoint):
     """
     Format the URL by properly joining the base URL and endpoint.
@@ -31,3 +35,22 @@ def format_url(base_url, endpoint):
     base_url = base_url.rstrip('/') + '/'
     endpoint = endpoint.lstrip('/')
     return urljoin(base_url, endpoint)
+
+def now_iso():
+    """
+    Get the current local time as an ISO 8601 string with seconds precision.
+
+    The formatted string is cached and only regenerated when the wall-clock
+    second rolls over, so repeated calls within the same second skip the
+    datetime construction and formatting.
+
+    Returns:
+        str: The current time in ISO 8601 format.
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, timestamp = _timestamp_cache
+    if second != cached_second:
+        timestamp = datetime.fromtimestamp(second).isoformat()
+        _timestamp_cache = (second, timestamp)
+    return timestamp
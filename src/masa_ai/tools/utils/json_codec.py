@@ -0,0 +1,88 @@
+"""
+JSON codec module for the MASA project.
+
+This module provides the JSON encoding and decoding used for the files the
+orchestration layer persists. orjson is used when it is installed; otherwise
+the standard library json module is used. Both backends produce the same
+documents, so files written by one can be read by the other.
+"""
+
+import os
+import mmap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+JSONDecodeError = orjson.JSONDecodeError if orjson else json.JSONDecodeError
+
+
+def dumps(obj, indent=False, sort_keys=False):
+    """
+    Encode an object as UTF-8 JSON.
+
+    With orjson the bytes are produced directly, without an intermediate str.
+
+    Args:
+        obj (object): The object to encode.
+        indent (bool): Whether to pretty-print with two-space indentation.
+        sort_keys (bool): Whether to sort the keys of dictionaries.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    if orjson:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+
+
+def loads(data):
+    """
+    Decode a JSON document.
+
+    Args:
+        data (bytes or str): The JSON document to decode.
+
+    Returns:
+        object: The decoded object.
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON.
+    """
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path):
+    """
+    Decode the JSON document stored in a file.
+
+    With orjson the file is memory-mapped and parsed in place, so large files
+    are not copied into an intermediate bytes object first.
+
+    Args:
+        path (str or Path): Path to the file.
+
+    Returns:
+        object: The decoded object.
+
+    Raises:
+        JSONDecodeError: If the file does not contain valid JSON.
+    """
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if not orjson or size == 0:
+            return loads(file.read())
+        with mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
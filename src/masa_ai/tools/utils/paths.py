@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import pkg_resources
 from ...constants import CONFIG_DIR
@@ -65,6 +66,43 @@ def ensure_dir(directory: Path):
     """
     Path(directory).mkdir(parents=True, exist_ok=True)
 
+def atomic_write(path: Path, data: bytes, drop_cache: bool = False):
+    """
+    Atomically replace the contents of a file.
+
+    The data is written and synced to a temporary file next to ``path``, which
+    then replaces ``path``. Readers see either the old or the new contents,
+    never a partially written file. On POSIX the directory is synced as well so
+    the rename itself survives a crash.
+
+    :param path: Path to the file to write
+    :type path: Path
+    :param data: The new contents of the file, or a list of chunks to write in
+        order so large contents need not be joined into one buffer first
+    :type data: bytes or list
+    :param drop_cache: Whether to advise the kernel to evict the written pages
+        from the page cache, for files that are only read back on restart
+    :type drop_cache: bool
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with tmp_path.open('wb') as file:
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            file.write(data)
+        else:
+            file.writelines(data)
+        file.flush()
+        os.fsync(file.fileno())
+        if drop_cache and hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    os.replace(tmp_path, path)
+    if os.name == 'posix':
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
 def get_data_directory() -> Path:
     """
     Get the data directory from the global settings.
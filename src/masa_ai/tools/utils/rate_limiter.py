@@ -0,0 +1,93 @@
+"""
+Rate Limiter module for the MASA project.
+
+This module provides the TokenBucket class, a thread-safe client-side rate
+limiter used to hold back API calls that would otherwise be rejected with
+a 429 and burn retries.
+"""
+
+import time
+import threading
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    The bucket holds up to ``capacity`` tokens and is refilled continuously at
+    ``refill_per_sec`` tokens per second. Callers acquire tokens before issuing
+    a request and block until enough tokens are available.
+
+    Attributes:
+        capacity (float): Maximum number of tokens the bucket can hold.
+        refill_per_sec (float): Number of tokens added to the bucket per second.
+    """
+
+    def __init__(self, capacity, refill_per_sec):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            capacity (float): Maximum number of tokens the bucket can hold.
+            refill_per_sec (float): Number of tokens added to the bucket per second.
+
+        Raises:
+            ValueError: If capacity or refill_per_sec is not positive.
+        """
+        if capacity <= 0 or refill_per_sec <= 0:
+            raise ValueError("capacity and refill_per_sec must be positive")
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accrued since the last refill. Must be called with the lock held."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_sec)
+        self._last_refill = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens from the bucket without blocking.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            bool: True if the tokens were taken, False otherwise.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """
+        Take tokens from the bucket, sleeping until enough are available.
+
+        Args:
+            tokens (float): Number of tokens to take.
+
+        Returns:
+            float: The total time spent waiting, in seconds.
+
+        Raises:
+            ValueError: If more tokens are requested than the bucket can hold.
+        """
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.refill_per_sec
+            time.sleep(wait)
+            waited += wait
@@ -7,6 +7,7 @@ time, tweets per minute, and unique workers involved in the scraping process.
 """
 
 import time
+import threading
 from statistics import mean
 from masa_ai.tools.qc.qc_manager import QCManager
 
@@ -14,6 +15,9 @@ class TweetStats:
     """
     Class to track and log statistics for tweet scraping jobs.
 
+    A scraper and its statistics are shared by the request workers, so the
+    counters are updated and read under a lock.
+
     Attributes:
         total_tweets (int): Total number of tweets fetched.
         api_call_count (int): Total number of API calls made.
@@ -34,6 +38,7 @@ class TweetStats:
         self.total_response_time = 0.0
         self.unique_workers = set()
         self.qc_manager = qc_manager
+        self._lock = threading.Lock()
 
     def update(self, new_tweets: int, response_time: float, worker_id: str):
         """
@@ -44,9 +49,10 @@ class TweetStats:
             response_time (float): Time taken for the API response.
             worker_id (str): ID of the worker that fetched the tweets.
         """
-        self.total_tweets += new_tweets
+        with self._lock:
+            self.total_tweets += new_tweets
+            self.unique_workers.add(worker_id)
         self.update_response_time(response_time)
-        self.unique_workers.add(worker_id)
 
     def update_response_time(self, elapsed_time: float):
         """
@@ -55,8 +61,9 @@ class TweetStats:
         Args:
             elapsed_time (float): The elapsed time for the API response.
         """
-        self.total_response_time += elapsed_time
-        self.api_call_count += 1
+        with self._lock:
+            self.total_response_time += elapsed_time
+            self.api_call_count += 1
 
     def get_stats(self) -> tuple:
         """
@@ -65,10 +72,12 @@ class TweetStats:
         Returns:
             tuple: Total tweets, average response time, tweets per minute, unique workers.
         """
-        avg_response_time = (self.total_response_time / self.api_call_count) if self.api_call_count else 0
-        tweets_per_minute = (self.total_tweets / self.total_response_time * 60) if self.total_response_time else 0
-        unique_workers = len(self.unique_workers)
-        return self.total_tweets, avg_response_time, tweets_per_minute, unique_workers
+        with self._lock:
+            total_tweets, total_response_time, api_call_count = self.total_tweets, self.total_response_time, self.api_call_count
+            unique_workers = len(self.unique_workers)
+        avg_response_time = (total_response_time / api_call_count) if api_call_count else 0
+        tweets_per_minute = (total_tweets / total_response_time * 60) if total_response_time else 0
+        return total_tweets, avg_response_time, tweets_per_minute, unique_workers
 
     def get_colored_stats(self) -> str:
         """
@@ -0,0 +1,27 @@
+"""
+Tests for the AppendLog class in the MASA project.
+
+Run these tests with pytest.
+"""
+
+import tempfile
+from pathlib import Path
+from masa_ai.tools.utils.append_log import AppendLog
+
+def test_append_log_appends_and_removes():
+    """
+    Test that appends accumulate in the log file and that remove deletes it.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "state.json.wal"
+        path.write_bytes(b'existing\n')
+        log = AppendLog(path)
+        log.append(b'first\n')
+        log.append(b'second\n')
+        assert path.read_bytes() == b'existing\nfirst\nsecond\n'
+
+        log.remove()
+        assert not path.exists()
+        log.append(b'third\n')
+        assert path.read_bytes() == b'third\n'
+        log.close()
@@ -0,0 +1,164 @@
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from masa_ai.tools.utils.data_storage import DataStorage
+
+
+@pytest.fixture
+def data_storage(tmp_path):
+    """
+    Fixture to create a DataStorage instance writing to a temporary directory.
+    """
+    with patch.object(DataStorage, '_get_data_directory', return_value=str(tmp_path)):
+        yield DataStorage()
+
+
+def test_save_json_appends_in_place(data_storage, tmp_path):
+    """
+    Test that appending batches produces the same file as a full rewrite.
+    """
+    first = [{'id': 1, 'text': 'first'}]
+    second = [{'id': 2, 'nested': {'values': [1, 2]}}, {'id': 3, 'text': 'ünïcode'}]
+
+    data_storage.save_data(first, 'xtwitter', 'my query')
+    data_storage.save_data(second, 'xtwitter', 'my query')
+
+    file_path = Path(data_storage.get_file_path('xtwitter', 'my query'))
+    content = file_path.read_text()
+    assert json.loads(content) == first + second
+    assert content == json.dumps(first + second, indent=4)
+
+
+def test_save_json_appends_compact(data_storage):
+    """
+    Test that the compact format is appended consistently when JSON_INDENT is None.
+    """
+    data_storage._json_indent = None
+    first = [{'id': 1}, {'id': 2}]
+    second = [{'id': 3}]
+
+    data_storage.save_data(first, 'xtwitter', 'compact')
+    data_storage.save_data(second, 'xtwitter', 'compact')
+
+    file_path = Path(data_storage.get_file_path('xtwitter', 'compact'))
+    assert file_path.read_text() == json.dumps(first + second)
+
+
+def test_save_json_appends_to_empty_list(data_storage):
+    """
+    Test that appending to an empty JSON list file works.
+    """
+    file_path = Path(data_storage.get_file_path('xtwitter', 'empty'))
+    file_path.write_text('[]')
+
+    data_storage.save_data([{'id': 1}], 'xtwitter', 'empty')
+
+    assert file_path.read_text() == json.dumps([{'id': 1}], indent=4)
+
+
+def test_save_json_overwrites_non_list(data_storage):
+    """
+    Test that a file that does not hold a JSON list is overwritten.
+    """
+    file_path = Path(data_storage.get_file_path('xtwitter', 'object'))
+    file_path.write_text('{"id": 0}')
+
+    data_storage.save_data([{'id': 1}], 'xtwitter', 'object')
+
+    assert json.loads(file_path.read_text()) == [{'id': 1}]
+
+
+def test_save_json_rewrites_file_with_corrupt_middle(data_storage):
+    """
+    Test that a list file with a corrupt record is not appended to but rewritten with a warning.
+    """
+    file_path = Path(data_storage.get_file_path('xtwitter', 'corrupt'))
+    file_path.write_text('[\n    {"id": 1},\n    {"id": 2, "te,\n    {"id": 3}\n]')
+
+    with patch.object(data_storage.qc_manager, 'log_warning') as log_warning:
+        data_storage.save_data([{'id': 4}], 'xtwitter', 'corrupt')
+
+    log_warning.assert_called_once()
+    assert file_path.read_text() == json.dumps([{'id': 4}], indent=4)
+    assert not file_path.with_name(file_path.name + '.tmp').exists()
+
+
+def test_save_json_appends_after_record_larger_than_tail_window(data_storage):
+    """
+    Test that a file whose last record does not fit in the tail window is still appended in place.
+    """
+    first = [{'id': 1}, {'id': 2, 'text': 'x' * (2 * DataStorage.TAIL_WINDOW)}]
+    data_storage.save_data(first, 'xtwitter', 'large')
+
+    with patch('masa_ai.tools.utils.data_storage.json_codec.load_file') as load_file:
+        data_storage.save_data([{'id': 3}], 'xtwitter', 'large')
+
+    load_file.assert_not_called()
+    file_path = Path(data_storage.get_file_path('xtwitter', 'large'))
+    assert file_path.read_text() == json.dumps(first + [{'id': 3}], indent=4)
+
+
+def test_save_json_skips_duplicates(data_storage):
+    """
+    Test that records already saved to a file are not written again.
+    """
+    data_storage.save_data([{'id': 1}, {'id': 2}], 'xtwitter', 'dupes', dedupe=True)
+    data_storage.save_data([{'id': 2}, {'id': 3}, {'id': 3}], 'xtwitter', 'dupes', dedupe=True)
+    data_storage.save_data([{'id': 3}], 'xtwitter', 'dupes')
+
+    file_path = Path(data_storage.get_file_path('xtwitter', 'dupes'))
+    assert [record['id'] for record in json.loads(file_path.read_text())] == [1, 2, 3, 3]
+
+
+def test_save_json_keeps_records_without_id(data_storage):
+    """
+    Test that identical records without an ID are all saved.
+    """
+    data_storage.save_data([{'text': 'gm'}, {'text': 'gm'}], 'xtwitter', 'no-id', dedupe=True)
+
+    file_path = Path(data_storage.get_file_path('xtwitter', 'no-id'))
+    assert json.loads(file_path.read_text()) == [{'text': 'gm'}, {'text': 'gm'}]
+
+
+def test_save_json_dedupe_cache_is_shared_across_files(data_storage):
+    """
+    Test that the dedupe cache is bounded across all files together.
+    """
+    data_storage._seen_capacity = 3
+    data_storage.save_data([{'id': 1}, {'id': 2}], 'xtwitter', 'first', dedupe=True)
+    data_storage.save_data([{'id': 1}, {'id': 2}], 'xtwitter', 'second', dedupe=True)
+
+    assert len(data_storage._seen) == 3
+    file_path = Path(data_storage.get_file_path('xtwitter', 'second'))
+    assert json.loads(file_path.read_text()) == [{'id': 1}, {'id': 2}]
+
+
+def test_save_json_seeds_duplicates_from_existing_file(data_storage):
+    """
+    Test that a new instance does not re-append records already in the file.
+    """
+    file_path = Path(data_storage.get_file_path('xtwitter', 'existing'))
+    file_path.write_text(json.dumps([{'Tweet': {'ID': 'a'}}], indent=4))
+
+    data_storage.save_data([{'Tweet': {'ID': 'a'}}, {'Tweet': {'ID': 'b'}}], 'xtwitter', 'existing', dedupe=True)
+
+    assert json.loads(file_path.read_text()) == [{'Tweet': {'ID': 'a'}}, {'Tweet': {'ID': 'b'}}]
+
+
+def test_save_json_seeds_duplicates_from_file_tail_only(data_storage):
+    """
+    Test that seeding reads only the configured tail of the file instead of parsing all of it.
+    """
+    file_path = Path(data_storage.get_file_path('xtwitter', 'tail'))
+    existing = [{'id': i, 'text': 'x' * 100} for i in range(50)]
+    file_path.write_text(json.dumps(existing, indent=4))
+    data_storage._seed_bytes = 1024
+
+    with patch('masa_ai.tools.utils.data_storage.json_codec.load_file') as load_file:
+        data_storage.save_data([{'id': 0}, {'id': 49}], 'xtwitter', 'tail', dedupe=True)
+
+    load_file.assert_not_called()
+    # The recent record is recognised; the old one is outside the seeded tail
+    assert [record['id'] for record in json.loads(file_path.read_text())] == list(range(50)) + [0]
+    assert len(data_storage._seen) < 50
@@ -0,0 +1,24 @@
+"""
+Tests for the helper functions in the MASA project.
+
+Run these tests with pytest.
+"""
+
+from datetime import datetime
+from masa_ai.tools.utils import helper_functions
+from masa_ai.tools.utils.helper_functions import now_iso
+
+def test_now_iso_regenerates_on_second_rollover(monkeypatch):
+    """
+    Test that now_iso reuses the formatted timestamp within a second and refreshes it on the next one.
+    """
+    clock = [1723680000.2]
+    monkeypatch.setattr(helper_functions.time, 'time', lambda: clock[0])
+    monkeypatch.setattr(helper_functions, '_timestamp_cache', (None, ''))
+
+    first = now_iso()
+    assert first == datetime.fromtimestamp(1723680000).isoformat()
+    clock[0] = 1723680000.9
+    assert now_iso() is first
+    clock[0] = 1723680001.1
+    assert now_iso() == datetime.fromtimestamp(1723680001).isoformat()
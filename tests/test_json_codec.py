@@ -0,0 +1,45 @@
+"""
+Tests for the json_codec module in the MASA project.
+
+Run these tests with pytest.
+"""
+
+import json
+import tempfile
+import pytest
+from pathlib import Path
+from masa_ai.tools.utils import json_codec
+
+def test_json_codec_round_trip():
+    """
+    Test that encoded documents decode to the original object and are valid JSON.
+    """
+    obj = {'requests': {'req1': {'status': 'queued', 'priority': 1}}, 'queue': [(1, 'req1')]}
+    for indent in (False, True):
+        data = json_codec.dumps(obj, indent=indent)
+        assert isinstance(data, bytes)
+        assert json_codec.loads(data) == json.loads(data) == {**obj, 'queue': [[1, 'req1']]}
+    assert b'\n' not in json_codec.dumps(obj)
+    assert json_codec.dumps({'b': 1, 'a': 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert b'\n  "requests"' in json_codec.dumps(obj, indent=True)
+
+def test_json_codec_invalid_document():
+    """
+    Test that invalid JSON raises the codec's JSONDecodeError, which is also a json.JSONDecodeError.
+    """
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(b'{"truncated": ')
+    assert issubclass(json_codec.JSONDecodeError, json.JSONDecodeError)
+
+def test_json_codec_load_file():
+    """
+    Test that documents are loaded from files, and that empty files are rejected.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "state.json"
+        path.write_bytes(json_codec.dumps({'requests': {'req1': {'status': 'queued'}}}))
+        assert json_codec.load_file(path) == {'requests': {'req1': {'status': 'queued'}}}
+
+        path.write_bytes(b'')
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.load_file(path)
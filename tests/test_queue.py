@@ -0,0 +1,233 @@
+"""
+Tests for the Queue class in the MASA project.
+
+Run these tests with pytest.
+"""
+
+import pytest
+import tempfile
+import json
+import time
+import threading
+from pathlib import Path
+from masa_ai.orchestration.queue import Queue
+from masa_ai.orchestration.state_manager import StateManager
+
+@pytest.fixture
+def temp_queue():
+    """
+    Fixture to create a Queue backed by a StateManager in a temporary directory.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_manager = StateManager(Path(temp_dir) / "request_manager_state.json", flush_interval=None)
+        state_manager.load_state()
+        yield Queue(state_manager, Path(temp_dir) / "request_queue.json", flush_interval=None)
+
+def test_queue_orders_by_priority_then_insertion(temp_queue):
+    """
+    Test that requests are served by priority, and in insertion order within a priority.
+    """
+    temp_queue.add({'id': 'req-b', 'priority': 2})
+    temp_queue.add({'id': 'req-z', 'priority': 1})
+    temp_queue.add({'id': 'req-a', 'priority': 2})
+    temp_queue.add({'id': 'req-z', 'priority': 1})
+
+    assert len(temp_queue) == 3
+    assert temp_queue.peek() == {'id': 'req-z', 'priority': 1}
+    assert [temp_queue.get()[0] for _ in range(3)] == ['req-z', 'req-b', 'req-a']
+    assert temp_queue.get() == (None, None)
+
+def test_queue_mixes_default_and_explicit_priorities(temp_queue):
+    """
+    Test that default-priority requests are served in order between higher and lower priorities.
+    """
+    temp_queue.add({'id': 'req-default-1'})
+    temp_queue.add({'id': 'req-low', 'priority': 200})
+    temp_queue.add({'id': 'req-default-2', 'priority': 100})
+    temp_queue.add({'id': 'req-high', 'priority': 5})
+    temp_queue.remove('req-default-1')
+
+    assert temp_queue.peek() == {'id': 'req-high', 'priority': 5}
+    assert [temp_queue.get()[0] for _ in range(3)] == ['req-high', 'req-default-2', 'req-low']
+    assert temp_queue.get() == (None, None)
+
+def test_queue_remove_and_reprioritize(temp_queue):
+    """
+    Test that removed and superseded entries are never served.
+    """
+    temp_queue.add({'id': 'req1', 'priority': 1})
+    temp_queue.add({'id': 'req2', 'priority': 2})
+    temp_queue.add({'id': 'req3', 'priority': 3})
+    temp_queue.remove('req1')
+    temp_queue.add({'id': 'req3', 'priority': 0})
+
+    assert len(temp_queue) == 2
+    assert [item['id'] for item in temp_queue.get_queue_summary()] == ['req3', 'req2']
+    assert [temp_queue.get()[0] for _ in range(2)] == ['req3', 'req2']
+    assert temp_queue.get() == (None, None)
+    assert len(temp_queue) == 0
+
+def test_queue_add_many_records_one_batch(temp_queue):
+    """
+    Test that a bulk add queues new requests and records their operations together.
+    """
+    temp_queue.add({'id': 'req1'})
+    temp_queue.flush()
+    temp_queue.add_many([{'id': 'req1'}, {'id': 'req2', 'priority': 1}, {'id': 'req3'}])
+
+    assert len(temp_queue) == 3
+    assert [op['id'] for op in temp_queue._pending_ops] == ['req2', 'req3']
+    assert temp_queue.get_status('req3')['status'] == 'queued'
+    assert [temp_queue.get()[0] for _ in range(3)] == ['req2', 'req1', 'req3']
+
+def test_queue_membership(temp_queue):
+    """
+    Test that membership reflects added, removed and served requests.
+    """
+    temp_queue.add({'id': 'req1'})
+    temp_queue.add({'id': 'req2', 'priority': 1})
+    temp_queue.add({'id': 'req3'})
+    temp_queue.remove('req3')
+
+    assert 'req1' in temp_queue and 'req2' in temp_queue
+    assert 'req3' not in temp_queue
+    assert temp_queue.get()[0] == 'req2'
+    assert 'req2' not in temp_queue
+
+def test_queue_complete_queued_request(temp_queue):
+    """
+    Test that completing a request that is still queued keeps it from being served.
+    """
+    temp_queue.add({'id': 'req1'})
+    temp_queue.add({'id': 'req2'})
+    temp_queue.complete('req1')
+
+    assert 'req1' not in temp_queue
+    assert temp_queue.get_status('req1')['status'] == 'completed'
+    assert temp_queue.get()[0] == 'req2'
+    assert temp_queue.get() == (None, None)
+
+def test_queue_flush_writes_priority_id_pairs(temp_queue):
+    """
+    Test that the queue file stores (priority, request_id) pairs.
+    """
+    temp_queue.add({'id': 'req1', 'priority': 5})
+    temp_queue.flush()
+
+    with temp_queue._queue_file.open('r') as file:
+        assert json.load(file) == [[5, 'req1']]
+    assert not temp_queue._dirty
+
+def test_queue_save_is_atomic(temp_queue):
+    """
+    Test that saving replaces the queue file without leaving a temporary file behind.
+    """
+    temp_queue.add({'id': 'req1'})
+    temp_queue._save_queue()
+
+    queue_file = temp_queue._queue_file
+    assert not queue_file.with_name(queue_file.name + '.tmp').exists()
+    with queue_file.open('r') as file:
+        assert json.load(file) == [[100, 'req1']]
+
+def test_queue_operation_log_replay(temp_queue):
+    """
+    Test that changes after the first snapshot are appended to the operation log and replayed on load.
+    """
+    temp_queue.add({'id': 'req1', 'priority': 1})
+    temp_queue.add({'id': 'req2', 'priority': 2})
+    temp_queue.flush()
+    temp_queue.get()
+    assert not temp_queue._dirty
+    temp_queue.add({'id': 'req3', 'priority': 3})
+    temp_queue.flush()
+
+    with temp_queue._queue_file.open('r') as file:
+        assert json.load(file) == [[1, 'req1'], [2, 'req2']]
+    assert temp_queue._wal_entries == 1
+
+    temp_queue.complete('req1')
+    temp_queue.state_manager.flush()
+    state_manager = StateManager(temp_queue.state_manager._state_file, flush_interval=None)
+    state_manager.load_state()
+    reloaded = Queue(state_manager, temp_queue._queue_file, flush_interval=None)
+    assert [item['id'] for item in reloaded.get_queue_summary()] == ['req2', 'req3']
+
+def test_queue_load_reconciles_file_with_state(temp_queue):
+    """
+    Test that a reloaded queue keeps its saved order and priorities but holds only active requests.
+    """
+    temp_queue.add({'id': 'req1'})
+    temp_queue.add({'id': 'req2'})
+    temp_queue.add({'id': 'req3', 'priority': 5})
+    temp_queue.add({'id': 'req3', 'priority': 1})
+    temp_queue.flush()
+
+    state_manager = temp_queue.state_manager
+    state_manager.update_request_state('req1', 'cancelled')
+    state_manager.update_request_state('req4', 'queued', request_details={'priority': 3})
+    reloaded = Queue(state_manager, temp_queue._queue_file, flush_interval=None)
+
+    assert [(item['id'], item['priority']) for item in reloaded.get_queue_summary()] == [
+        ('req3', 1), ('req4', 3), ('req2', 100)
+    ]
+
+def test_queue_operation_log_compaction(temp_queue):
+    """
+    Test that the operation log is folded into a new snapshot once it is full.
+    """
+    temp_queue.MAX_WAL_ENTRIES = 2
+    temp_queue.add({'id': 'req1', 'priority': 1})
+    temp_queue.flush()
+
+    for i in range(2, 5):
+        temp_queue.add({'id': f'req{i}', 'priority': i})
+        temp_queue.flush()
+
+    assert not temp_queue._wal_file.exists()
+    assert temp_queue._wal_entries == 0
+    with temp_queue._queue_file.open('r') as file:
+        assert sorted(json.load(file)) == [[1, 'req1'], [2, 'req2'], [3, 'req3'], [4, 'req4']]
+
+def test_queue_background_flush_coalesces_changes():
+    """
+    Test that a burst of queue changes is written by the background flusher in a single write.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_manager = StateManager(Path(temp_dir) / "request_manager_state.json", flush_interval=None)
+        state_manager.load_state()
+        queue = Queue(state_manager, Path(temp_dir) / "request_queue.json", flush_interval=0.05)
+        writes = []
+        original_save_queue = queue._save_queue
+        queue._save_queue = lambda: (writes.append(len(queue)), original_save_queue())
+
+        for i in range(10):
+            queue.add({'id': f'req{i}', 'priority': i})
+        queue.get()
+
+        deadline = time.monotonic() + 2
+        while queue._dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        queue.close()
+
+        assert writes == [9]
+        with queue._queue_file.open('r') as file:
+            assert len(json.load(file)) == 9
+
+def test_queue_snapshot_waits_for_changes_in_progress(temp_queue):
+    """
+    Test that a snapshot is taken under the same lock as queue changes, so it never sees a half-applied change.
+    """
+    temp_queue.add({'id': 'req1', 'priority': 1})
+    temp_queue.add({'id': 'req2'})
+
+    with temp_queue._lock:
+        saver = threading.Thread(target=temp_queue._save_queue)
+        saver.start()
+        saver.join(0.1)
+        assert saver.is_alive()
+        # Move req2 from the default deque to the heap while the snapshot waits
+        temp_queue._push(1, 'req2')
+    saver.join(5)
+
+    assert json.loads(temp_queue._queue_file.read_text()) == [[1, 'req1'], [1, 'req2']]
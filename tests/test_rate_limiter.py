@@ -0,0 +1,71 @@
+import pytest
+import threading
+import time
+from unittest.mock import patch
+from masa_ai.configs.config import initialize_config
+from masa_ai.connections.xtwitter_connection import XTwitterConnection
+from masa_ai.tools.utils.rate_limiter import TokenBucket
+
+
+def test_try_acquire_until_empty():
+    """
+    Test that tokens can be taken until the bucket is empty.
+    """
+    bucket = TokenBucket(capacity=2, refill_per_sec=0.001)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_acquire_sleeps_until_refilled():
+    """
+    Test that acquire sleeps for the time needed to refill a missing token.
+    """
+    bucket = TokenBucket(capacity=1, refill_per_sec=10)
+    bucket.acquire()
+    with patch('masa_ai.tools.utils.rate_limiter.time.sleep') as mock_sleep:
+        mock_sleep.side_effect = lambda seconds: setattr(bucket, '_tokens', bucket.capacity)
+        waited = bucket.acquire()
+    assert mock_sleep.call_count == 1
+    assert 0 < waited <= 0.1
+
+
+def test_invalid_configuration():
+    """
+    Test that invalid bucket settings are rejected.
+    """
+    with pytest.raises(ValueError):
+        TokenBucket(capacity=0, refill_per_sec=1)
+    bucket = TokenBucket(capacity=1, refill_per_sec=1)
+    with pytest.raises(ValueError):
+        bucket.acquire(2)
+
+
+def test_connection_shares_one_bucket_per_endpoint():
+    """
+    Test that workers asking for an endpoint's rate limiter at the same time get the same bucket.
+    """
+    initialize_config()
+    connection = XTwitterConnection()
+    created = []
+    def create_bucket(capacity, refill_per_sec):
+        time.sleep(0.05)
+        bucket = TokenBucket(capacity, refill_per_sec)
+        created.append(bucket)
+        return bucket
+
+    started = threading.Barrier(4, timeout=5)
+    buckets = []
+    def get_rate_limiter():
+        started.wait()
+        buckets.append(connection.get_rate_limiter('data/twitter/tweets/recent'))
+
+    with patch('masa_ai.connections.xtwitter_connection.TokenBucket', side_effect=create_bucket):
+        threads = [threading.Thread(target=get_rate_limiter) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(created) == 1
+    assert buckets == created * 4
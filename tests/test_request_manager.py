@@ -12,8 +12,12 @@ import pytest
 import tempfile
 import os
 import json
+import threading
+import time
+from unittest.mock import patch
 from pathlib import Path
 from masa_ai.orchestration.request_manager import RequestManager
+from masa_ai.orchestration.queue import Queue
 from masa_ai.orchestration.state_manager import StateManager
 from masa_ai.tools.qc.qc_manager import QCManager
 from masa_ai.configs.config import initialize_config
@@ -206,3 +210,143 @@ def test_request_manager_clear_requests_invalid_ids(temp_request_manager, caplog
     warning_messages = [record.getMessage() for record in caplog.records if record.levelname == 'WARNING']
     assert "Request ID req3 not found" in warning_messages[0]
     assert "Request ID req4 not found" in warning_messages[1]
+
+def test_request_manager_generate_request_id_is_stable(temp_request_manager):
+    """
+    Test that request IDs ignore any 'id' key and keep their persisted format.
+    """
+    request = {
+        'scraper': 'XTwitterScraper',
+        'endpoint': 'data/twitter/tweets/recent',
+        'priority': 1,
+        'params': {'query': '#AI since:2024-08-01 until:2024-08-03', 'count': 100}
+    }
+    expected = 'afc73016cb119acc769a24f1594f1fe761a47c45a1d3af11021008cd49e6ae1c'
+    assert temp_request_manager._generate_request_id(request) == expected
+    assert temp_request_manager._generate_request_id({**request, 'id': 'old'}) == expected
+
+def test_request_manager_resume_incomplete_requests(temp_request_manager):
+    """
+    Test that incomplete requests are re-queued from their stored request details.
+    """
+    state_manager = temp_request_manager.state_manager
+    request = {'scraper': 'XTwitterScraper', 'endpoint': 'data/twitter/tweets/recent', 'priority': 1, 'params': {'query': '#AI', 'count': 10}}
+    state_manager.update_request_state('req1', 'failed', request_details=request)
+    state_manager.update_request_state('req2', 'completed', request_details=request)
+
+    temp_request_manager.resume_incomplete_requests()
+    try:
+        assert len(temp_request_manager.queue) == 1
+        assert temp_request_manager.queue.get()[0] == 'req1'
+        assert state_manager.get_request_state('req1')['status'] == 'queued'
+    finally:
+        temp_request_manager.queue.close()
+
+def test_request_manager_resume_skips_queued_requests(temp_request_manager):
+    """
+    Test that resuming does not queue a request twice.
+    """
+    state_manager = temp_request_manager.state_manager
+    request = {'scraper': 'XTwitterScraper', 'endpoint': 'data/twitter/tweets/recent', 'params': {'query': '#AI', 'count': 10}}
+    state_manager.update_request_state('req1', 'queued', request_details=request)
+    state_manager.update_request_state('req2', 'in_progress', request_details=request)
+
+    temp_request_manager.resume_incomplete_requests()
+    temp_request_manager.resume_incomplete_requests()
+    try:
+        assert len(temp_request_manager.queue) == 2
+        assert {temp_request_manager.queue.get()[0] for _ in range(2)} == {'req1', 'req2'}
+        assert temp_request_manager.queue.get() == (None, None)
+    finally:
+        temp_request_manager.queue.close()
+
+def test_request_manager_processes_requests_concurrently(temp_request_manager):
+    """
+    Test that queued requests are processed on several workers at once and all complete.
+    """
+    state_manager = temp_request_manager.state_manager
+    for i in range(6):
+        state_manager.update_request_state(f'req{i}', 'queued', request_details={'params': {'query': f'q{i}'}})
+    temp_request_manager.queue = Queue(state_manager, temp_request_manager.queue_file, flush_interval=None)
+    temp_request_manager.config = {'request_manager.MAX_WORKERS': 3}
+
+    started = threading.Barrier(3, timeout=5)
+    def route_request(request_id, request):
+        if request_id in ('req0', 'req1', 'req2'):
+            started.wait()
+        if request_id == 'req3':
+            raise ValueError("boom")
+        return 1, 1
+    temp_request_manager.request_router.route_request = route_request
+
+    try:
+        temp_request_manager._process_queue()
+        statuses = {f'req{i}': state_manager.get_request_state(f'req{i}')['status'] for i in range(6)}
+        assert statuses == {'req0': 'completed', 'req1': 'completed', 'req2': 'completed',
+                            'req3': 'failed', 'req4': 'completed', 'req5': 'completed'}
+    finally:
+        temp_request_manager.queue.close()
+
+def test_request_manager_queue_actions_without_prompt(temp_request_manager, tmp_path):
+    """
+    Test that a request list can be previewed and cancelled without prompting the user.
+    """
+    request = {'scraper': 'XTwitterScraper', 'endpoint': 'data/twitter/tweets/recent', 'params': {'query': '#AI', 'count': 10}}
+    request_list_file = tmp_path / "requests.json"
+    request_list_file.write_text(json.dumps([{**request, 'id': 'req1', 'status': 'queued'}, request, None]))
+    temp_request_manager.state_manager.update_request_state('req1', 'queued', request_details=request)
+
+    assert temp_request_manager.build_queue_preview(request_list_file) == [
+        ('req1', 'Unknown', 'queued'),
+        (temp_request_manager._generate_request_id(request), 'Unknown', 'Unknown'),
+    ]
+
+    temp_request_manager.apply_action('Cancel', request_list_file)
+    assert temp_request_manager.state_manager.get_request_state('req1')['status'] == 'cancelled'
+
+def test_request_manager_processing_keeps_request_details(temp_request_manager):
+    """
+    Test that processing a request updates its status without rewriting its request_details.
+    """
+    state_manager = StateManager(temp_request_manager.state_file, flush_interval=None)
+    state_manager.load_state()
+    temp_request_manager.state_manager = state_manager
+    request = {'scraper': 'XTwitterScraper', 'params': {'query': '#AI', 'count': 10}}
+    state_manager.update_request_state('req1', 'queued', request_details=request)
+    state_manager.flush()
+    temp_request_manager.request_router.route_request = lambda request_id, request: (5, 1)
+
+    temp_request_manager._process_single_request('req1', state_manager.get_request_state('req1')['request_details'])
+
+    request_state = state_manager.get_request_state('req1')
+    assert request_state['status'] == 'completed'
+    assert request_state['request_details'] == request
+    assert state_manager._dirty_requests == {'req1'}
+    assert not state_manager._dirty_details
+
+def test_request_manager_workers_share_one_scraper(temp_request_manager):
+    """
+    Test that workers asking for a scraper at the same time get a single shared instance.
+    """
+    router = temp_request_manager.request_router
+    created = []
+    def create_scraper(state_manager, request):
+        created.append(request)
+        time.sleep(0.05)
+        return object()
+
+    started = threading.Barrier(4, timeout=5)
+    scrapers = []
+    def get_scraper():
+        started.wait()
+        scrapers.append(router.get_scraper('XTwitterScraper', {}))
+
+    with patch('masa_ai.orchestration.request_router.XTwitterScraper', side_effect=create_scraper):
+        threads = [threading.Thread(target=get_scraper) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(created) == 1
+    assert len(scrapers) == 4 and all(scraper is scrapers[0] for scraper in scrapers)
@@ -209,5 +209,7 @@ def test_wait_with_progress(mock_qc_manager, retry_settings):
 
         # Assert that sleep was called multiple times to simulate waiting
         assert mock_sleep.call_count > 0
+        # Assert that each sleep lasts at most a second
+        assert all(0 < call.args[0] <= 1.0 for call in mock_sleep.call_args_list)
         # Assert that pbar.update was called to reflect progress updates
         mock_pbar.update.assert_called()
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from masa_ai.configs.config import initialize_config
+from masa_ai.tools.scrape.scrape_xtwitter import XTwitterScraper
+
+
+@pytest.fixture
+def scraper():
+    """
+    Fixture to create an XTwitterScraper with a mocked state manager, connection and storage.
+    """
+    initialize_config()
+    request = {
+        'scraper': 'XTwitterScraper',
+        'endpoint': 'data/twitter/tweets/recent',
+        'params': {'query': 'masa since:2024-08-10 until:2024-08-12', 'count': 10}
+    }
+    state_manager = MagicMock()
+    state_manager.get_request_state.return_value = {'status': 'in_progress', 'request_details': request}
+    with patch('masa_ai.tools.scrape.scrape_xtwitter.XTwitterConnection'), \
+         patch('masa_ai.tools.scrape.scrape_xtwitter.DataStorage'), \
+         patch('masa_ai.tools.scrape.scrape_xtwitter.time.sleep'):
+        scraper = XTwitterScraper(state_manager, request)
+        scraper.twitter_connection.get_tweets.return_value = {'data': [{'id': 1}, {'id': 2}]}
+        yield scraper
+
+
+def test_scrape_tweets_single_state_write_per_day(scraper):
+    """
+    Test that each scraped day produces exactly one progress checkpoint.
+    """
+    records_fetched, api_calls_count = scraper.scrape_tweets('req1', 'masa since:2024-08-10 until:2024-08-12', 10)
+
+    assert (records_fetched, api_calls_count) == (6, 3)
+    scraper.state_manager.update_request_state.assert_not_called()
+    progress = [call.args[1] for call in scraper.state_manager.update_progress.call_args_list]
+    assert progress == ['2024-08-11', '2024-08-10', '2024-08-09']
+    assert all(call.kwargs['save'] is False for call in scraper.state_manager.update_progress.call_args_list)
+    scraper.state_manager.flush.assert_called_once()
+
+
+def test_scrape_tweets_skips_scraped_window(scraper):
+    """
+    Test that a resumed request whose progress is past its window returns its stored result without calling the API.
+    """
+    scraper.state_manager.get_request_state.return_value = {
+        'status': 'in_progress',
+        'progress': {'last_processed_time': '2024-08-09'},
+        'result': {'records_fetched': 6, 'api_calls_count': 3}
+    }
+
+    assert scraper.scrape_tweets('req1', 'masa since:2024-08-10 until:2024-08-12', 10) == (6, 3)
+    scraper.twitter_connection.get_tweets.assert_not_called()
@@ -11,6 +11,7 @@ Run these tests with pytest.
 import pytest
 import tempfile
 import json
+import time
 from pathlib import Path
 from masa_ai.orchestration.state_manager import StateManager
 from masa_ai.tools.qc.qc_manager import QCManager
@@ -25,6 +26,26 @@ def temp_state_manager():
         state_manager = StateManager(state_file)
         state_manager.load_state()
         yield state_manager
+        state_manager.close()
+
+@pytest.fixture
+def state_manager():
+    """
+    Fixture to create a StateManager without a background flusher, so changes are only written on flush.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_manager = StateManager(Path(temp_dir) / "request_manager_state.json", flush_interval=None)
+        state_manager.load_state()
+        yield state_manager
+        state_manager.close()
+
+def _reload(state_manager):
+    """
+    Load the state file of a StateManager into a new StateManager.
+    """
+    reloaded = StateManager(state_manager._state_file, flush_interval=None)
+    reloaded.load_state()
+    return reloaded
 
 def test_state_manager_get_requests_by_status(temp_state_manager):
     """
@@ -47,6 +68,28 @@ def test_state_manager_get_requests_by_status(temp_state_manager):
     all_requests = temp_state_manager.get_requests_by_status()
     assert len(all_requests) == 4
 
+def test_state_manager_status_index_tracks_updates(temp_state_manager):
+    """
+    Test that status lookups follow status changes and removals.
+    """
+    for request_id in ['req1', 'req2', 'req3']:
+        temp_state_manager.update_request_state(request_id, 'queued')
+    temp_state_manager.update_request_state('req2', 'in_progress')
+    temp_state_manager.update_request_state('req3', 'completed')
+    temp_state_manager.remove_request_state('req1')
+    temp_state_manager.update_request_state('req4', 'queued')
+
+    assert list(temp_state_manager.get_active_requests()) == ['req2', 'req4']
+    assert list(temp_state_manager.get_requests_by_status(['completed'])) == ['req3']
+
+    temp_state_manager.clear_requests()
+    assert temp_state_manager.get_active_requests() == {}
+    assert set(temp_state_manager.get_requests_by_status(['cancelled'])) == {'req2', 'req4'}
+
+    all_requests = temp_state_manager.get_all_requests_state()
+    all_requests['req5'] = {}
+    assert not temp_state_manager.request_exists('req5')
+
 def test_state_manager_clear_requests(temp_state_manager):
     """
     Test clearing requests by status and IDs.
@@ -95,3 +138,319 @@ def test_state_manager_thread_safety(temp_state_manager):
     # Verify that the state is consistent
     final_status = temp_state_manager.get_request_state('req1')['status']
     assert final_status in ['queued', 'completed']
+
+def test_state_manager_update_progress(state_manager):
+    """
+    Test that update_progress only touches the progress checkpoint and honours save=False.
+    """
+    state_manager.update_request_state('req1', 'in_progress', request_details={'priority': 1})
+    state_manager.flush()
+
+    state_manager.update_progress('req1', '2024-08-16', save=False)
+    state = state_manager.get_request_state('req1')
+    assert state['progress'] == {'last_processed_time': '2024-08-16'}
+    assert state['status'] == 'in_progress'
+    assert state['request_details'] == {'priority': 1}
+
+    reloaded = _reload(state_manager)
+    assert 'progress' not in reloaded.get_request_state('req1')
+
+    state_manager.update_progress('req1', '2024-08-15')
+    reloaded.load_state()
+    assert reloaded.get_request_state('req1')['progress'] == {'last_processed_time': '2024-08-15'}
+
+def test_state_manager_flush_writes_dirty_state(state_manager):
+    """
+    Test that state changes are only written to disk on flush.
+    """
+    state_manager.update_request_state('req1', 'queued')
+    assert not state_manager._state_file.exists()
+
+    state_manager.flush()
+    with state_manager._state_file.open('r') as file:
+        contents = file.read()
+    saved = json.loads(contents)
+    assert saved['requests']['req1']['status'] == 'queued'
+    assert '\n' not in contents
+    assert not state_manager._dirty
+
+def test_state_manager_reads_do_not_wait_for_disk_writes(state_manager):
+    """
+    Test that the state can be read and updated while a flush is writing to disk.
+    """
+    state_manager.update_request_state('req1', 'queued')
+
+    with state_manager._write_lock:
+        assert state_manager.get_request_state('req1')['status'] == 'queued'
+        state_manager.update_request_state('req1', 'in_progress')
+    state_manager.flush()
+
+    reloaded = _reload(state_manager)
+    assert reloaded.get_request_state('req1')['status'] == 'in_progress'
+
+def test_state_manager_skips_unchanged_update(state_manager):
+    """
+    Test that repeating an update with identical data does not mark the state dirty.
+    """
+    request = {'id': 'req1', 'priority': 1, 'status': 'queued'}
+    state_manager.update_request_state('req1', 'in_progress', request_details=request)
+    state_manager.update_request_priority('req1', 2)
+    state_manager.flush()
+
+    state_manager.update_request_state('req1', 'in_progress', request_details=request)
+    state_manager.update_request_priority('req1', 2)
+    assert not state_manager._dirty
+
+    state_manager.update_request_state('req1', 'completed', result=(5, 1))
+    assert state_manager._dirty
+    assert state_manager.get_request_state('req1')['result'] == {'records_fetched': 5, 'api_calls_count': 1}
+
+def test_state_manager_background_flush_groups_changes():
+    """
+    Test that changes made within one flush window are written together.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_manager = StateManager(Path(temp_dir) / "request_manager_state.json", flush_interval=0.05)
+        state_manager.load_state()
+        writes = []
+        original_write_pending = state_manager._write_pending
+
+        def counting_write_pending():
+            if state_manager._dirty:
+                writes.append(len(state_manager._dirty_requests))
+            original_write_pending()
+
+        state_manager._write_pending = counting_write_pending
+        for i in range(20):
+            state_manager.update_request_state(f'req{i}', 'queued')
+
+        deadline = time.monotonic() + 2
+        while state_manager._dirty and time.monotonic() < deadline:
+            time.sleep(0.01)
+        state_manager.close()
+
+        assert writes == [20]
+        reloaded = _reload(state_manager)
+        assert len(reloaded.get_all_requests_state()) == 20
+
+def test_state_manager_flushes_full_batch_early():
+    """
+    Test that a full batch of changes is flushed without waiting for the window to end.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_manager = StateManager(Path(temp_dir) / "request_manager_state.json", flush_interval=60)
+        state_manager.load_state()
+        for i in range(StateManager.FLUSH_BATCH_SIZE):
+            state_manager.update_request_state(f'req{i}', 'queued')
+
+        deadline = time.monotonic() + 2
+        while not state_manager._state_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not state_manager._dirty
+        assert state_manager._state_file.exists()
+        state_manager.close()
+
+def test_state_manager_save_is_atomic(temp_state_manager):
+    """
+    Test that saving replaces the state file without leaving a temporary file behind.
+    """
+    temp_state_manager.update_request_state('req1', 'queued')
+    temp_state_manager.flush()
+
+    state_file = temp_state_manager._state_file
+    assert state_file.exists()
+    assert not state_file.with_name(state_file.name + '.tmp').exists()
+    with state_file.open('r') as file:
+        assert json.load(file)['requests']['req1']['status'] == 'queued'
+
+def test_state_manager_keeps_corrupt_state_file():
+    """
+    Test that an unreadable state file is moved aside instead of being overwritten.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state_file = Path(temp_dir) / "request_manager_state.json"
+        state_file.write_text('{"requests": {"req1": ')
+        state_manager = StateManager(state_file, flush_interval=None)
+        state_manager.load_state()
+
+        assert state_manager.get_all_requests_state() == {}
+        assert not state_file.exists()
+        assert state_file.with_name(state_file.name + '.corrupt').read_text() == '{"requests": {"req1": '
+
+def test_state_manager_wal_replay(state_manager):
+    """
+    Test that changes appended to the write-ahead log are replayed on load.
+    """
+    state_file = state_manager._state_file
+    state_manager.update_request_state('req1', 'queued')
+    state_manager.update_request_state('req2', 'queued')
+    state_manager.flush()
+    snapshot = state_file.read_text()
+
+    state_manager.update_request_state('req1', 'completed')
+    state_manager.remove_request_state('req2')
+    state_manager.flush()
+    assert state_file.read_text() == snapshot
+    assert state_manager._wal_file.exists()
+
+    reloaded = _reload(state_manager)
+    assert reloaded.get_request_state('req1')['status'] == 'completed'
+    assert not reloaded.request_exists('req2')
+
+def test_state_manager_wal_compaction(state_manager):
+    """
+    Test that the write-ahead log is folded into the snapshot once it is full.
+    """
+    state_file = state_manager._state_file
+    state_manager.MAX_WAL_ENTRIES = 2
+    state_manager.update_request_state('req1', 'queued')
+    state_manager.flush()
+
+    for status in ['in_progress', 'failed', 'completed']:
+        state_manager.update_request_state('req1', status)
+        state_manager.flush()
+
+    assert not state_manager._wal_file.exists()
+    with state_file.open('r') as file:
+        assert json.load(file)['requests']['req1']['status'] == 'completed'
+
+def test_state_manager_wal_compaction_scales_with_state(state_manager):
+    """
+    Test that a large state is not rewritten until the log has as many records as the state has requests.
+    """
+    state_manager.MAX_WAL_ENTRIES = 2
+    for i in range(5):
+        state_manager.update_request_state(f'req{i}', 'queued')
+    state_manager.flush()
+
+    for status in ['in_progress', 'failed', 'completed', 'queued']:
+        state_manager.update_request_state('req0', status)
+        state_manager.flush()
+    assert state_manager._wal_entries == 4
+
+    state_manager.update_request_state('req0', 'completed')
+    state_manager.flush()
+    state_manager.update_request_state('req0', 'failed')
+    state_manager.flush()
+    assert state_manager._wal_entries == 0
+    assert not state_manager._wal_file.exists()
+
+def test_state_manager_wal_ignores_stale_generation(state_manager):
+    """
+    Test that log records from before the latest snapshot are not replayed.
+    """
+    state_file = state_manager._state_file
+    state_manager.update_request_state('req1', 'queued')
+    state_manager.flush()
+    state_manager.update_request_state('req1', 'in_progress')
+    state_manager.flush()
+    stale_wal = state_manager._wal_file.read_bytes()
+
+    # Simulate a crash between writing a new snapshot and removing the log
+    state_manager.update_request_state('req1', 'completed')
+    state_manager._save_state()
+    state_manager._wal_file.write_bytes(stale_wal)
+
+    reloaded = _reload(state_manager)
+    assert reloaded.get_request_state('req1')['status'] == 'completed'
+
+def test_state_manager_wal_leaves_out_unchanged_request_details(state_manager):
+    """
+    Test that status changes log only the mutable fields and replay keeps the request details.
+    """
+    state_file = state_manager._state_file
+    details = {'scraper': 'XTwitterScraper', 'params': {'query': '#AI', 'count': 10}}
+    state_manager.update_request_state('req1', 'queued')
+    state_manager.flush()
+
+    state_manager.update_request_state('req1', 'queued', request_details=details)
+    state_manager.update_request_state('req2', 'queued', request_details=details)
+    state_manager.flush()
+    state_manager.update_request_state('req1', 'in_progress')
+    state_manager.update_request_state('req2', 'completed', request_details=details)
+    state_manager.flush()
+
+    records = [json.loads(line) for line in state_manager._wal_file.read_text().splitlines()]
+    assert [('request_details' in record['state'], record.get('partial', False)) for record in records] == [
+        (True, False), (True, False), (False, True), (False, True)
+    ]
+
+    reloaded = _reload(state_manager)
+    assert reloaded.get_request_state('req1')['request_details'] == details
+    assert reloaded.get_request_state('req1')['status'] == 'in_progress'
+    assert reloaded.get_request_state('req2')['request_details'] == details
+    assert reloaded.get_request_state('req2')['status'] == 'completed'
+
+def test_state_manager_snapshot_reuses_unchanged_entries(state_manager):
+    """
+    Test that snapshots re-encode only changed entries and still decode to the full state.
+    """
+    state_file = state_manager._state_file
+    state_manager.update_request_state('req1', 'queued', request_details={'params': {'query': '#AI'}})
+    state_manager.update_request_state('req2', 'queued')
+    state_manager._save_state()
+    cached = state_manager._encoded_requests['req1']
+
+    state_manager.update_request_state('req2', 'completed')
+    assert 'req2' not in state_manager._encoded_requests
+    state_manager._save_state()
+    assert state_manager._encoded_requests['req1'] is cached
+
+    with state_file.open('r') as file:
+        data = json.load(file)
+    assert data['requests'] == state_manager.get_all_requests_state()
+    assert data['last_updated'] == state_manager._state['last_updated']
+    assert data['wal_generation'] == state_manager._wal_generation
+
+def test_state_manager_coalesces_transitions_of_one_request(state_manager):
+    """
+    Test that several transitions of a request between flushes are logged as one record.
+    """
+    state_manager.update_request_state('req1', 'queued')
+    state_manager.flush()
+
+    state_manager.update_request_state('req1', 'in_progress')
+    state_manager.update_request_state('req1', 'completed', result=(5, 1))
+    state_manager.flush()
+
+    records = [json.loads(line) for line in state_manager._wal_file.read_text().splitlines()]
+    assert [record['state']['status'] for record in records] == ['completed']
+
+def test_state_manager_add_requests(state_manager):
+    """
+    Test that bulk-added requests match single updates and existing requests are kept.
+    """
+    state_manager.update_request_state('req1', 'completed')
+    details = {'priority': 1, 'status': 'ignored'}
+
+    assert state_manager.add_requests({'req1': details, 'req2': details}) == ['req2']
+    state_manager.update_request_state('req3', 'queued', request_details=details)
+
+    assert state_manager.get_request_state('req1')['status'] == 'completed'
+    added, updated = state_manager.get_request_state('req2'), state_manager.get_request_state('req3')
+    assert list(added) == list(updated)
+    assert added['request_details'] == updated['request_details'] == {'priority': 1}
+    assert list(state_manager.get_active_requests()) == ['req2', 'req3']
+    assert state_manager._dirty_requests == {'req1', 'req2', 'req3'}
+
+    state_manager.flush()
+    state_manager.update_request_state('req2', 'in_progress')
+    state_manager.flush()
+    assert _reload(state_manager).get_request_state('req2')['request_details'] == {'priority': 1}
+
+
+def test_state_manager_update_requests_state(state_manager):
+    """
+    Test that a bulk status update moves requests between statuses and skips unchanged ones.
+    """
+    details = {'priority': 1}
+    state_manager.update_request_state('req1', 'failed', request_details=details)
+    state_manager.update_request_state('req2', 'queued', request_details=details)
+    state_manager.flush()
+
+    state_manager.update_requests_state({'req1': details, 'req2': details, 'req3': details}, 'queued')
+
+    assert list(state_manager.get_requests_by_status(['queued'])) == ['req2', 'req1', 'req3']
+    assert state_manager.get_requests_by_status(['failed']) == {}
+    assert state_manager._dirty_requests == {'req1', 'req3'}
+    assert state_manager.get_request_state('req3')['request_details'] == details